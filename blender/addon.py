@@ -5,6 +5,7 @@ import mathutils
 import json
 import threading
 import socket
+import selectors
 import time
 import requests
 import tempfile
@@ -12,6 +13,15 @@ import traceback
 import os
 import shutil
 import zipfile
+import fnmatch
+import hashlib
+import bisect
+import re
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import itertools
+from collections import deque
 from bpy.props import StringProperty, IntProperty, BoolProperty, EnumProperty
 import io
 from contextlib import redirect_stdout, suppress
@@ -32,13 +42,937 @@ RODIN_FREE_TRIAL_KEY = "k9TcfFoEhNd9cCPP2guHAHHHkctZHIRhZDywZ1euGUXwihbYLpOjQhof
 REQ_HEADERS = requests.utils.default_headers()
 REQ_HEADERS.update({"User-Agent": "blender-mcp"})
 
+# One pooled session for all external HTTP calls, so connections are reused
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.headers.update(REQ_HEADERS)
+HTTP_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=16))
+HTTP_SESSION.mount("http://", requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=16))
+DOWNLOAD_WORKERS = 6  # Concurrent file downloads
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # Downloads are streamed to disk in chunks of this size
+
+class DownloadError(ValueError):
+    def __init__(self, url, status_code):
+        super().__init__(f"Download of {url} failed with status code {status_code}")
+        self.status_code = status_code
+
+class DownloadTracker:
+    """Progress of running downloads, readable from any thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active = {}
+        self._ids = itertools.count(1)
+
+    def begin(self, label, total):
+        download_id = next(self._ids)
+        with self._lock:
+            self._active[download_id] = {"label": label, "total": total, "done": 0, "started": time.time(), "reported": 0}
+        return download_id
+
+    def advance(self, download_id, amount):
+        with self._lock:
+            entry = self._active[download_id]
+            entry["done"] += amount
+            # Log every quarter of a download with known size
+            if entry["total"]:
+                quarter = entry["done"] * 4 // entry["total"]
+                if quarter > entry["reported"] and quarter < 4:
+                    entry["reported"] = quarter
+                    print(f"Downloading {entry['label']}: {quarter * 25}%")
+
+    def end(self, download_id):
+        with self._lock:
+            self._active.pop(download_id, None)
+
+    def snapshot(self):
+        now = time.time()
+        with self._lock:
+            return [
+                {
+                    "label": e["label"],
+                    "done_bytes": e["done"],
+                    "total_bytes": e["total"],
+                    "progress": round(e["done"] / e["total"], 3) if e["total"] else None,
+                    "bytes_per_second": int(e["done"] / max(now - e["started"], 0.001)),
+                }
+                for e in self._active.values()
+            ]
+
+DOWNLOADS = DownloadTracker()
+
+def stream_download(url, path, headers=None, timeout=60, label=None, on_chunk=None):
+    """Stream a URL into a file chunk by chunk and return the number of bytes written
+
+    Memory use stays at one chunk regardless of the file size. Progress is
+    visible through DOWNLOADS while the download runs.
+    """
+    with HTTP_SESSION.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code != 200:
+            raise DownloadError(url, response.status_code)
+        total = int(response.headers.get("Content-Length") or 0) or None
+        download_id = DOWNLOADS.begin(label or url.split("?")[0].split("/")[-1], total)
+        size = 0
+        try:
+            with open(path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    if on_chunk:
+                        on_chunk(chunk)
+                    size += len(chunk)
+                    DOWNLOADS.advance(download_id, len(chunk))
+        finally:
+            DOWNLOADS.end(download_id)
+    return size
+
+# Polyhaven API and local asset cache; the environment variables mainly exist for testing
+POLYHAVEN_API = os.environ.get("BLENDERMCP_POLYHAVEN_API", "https://api.polyhaven.com")
+ASSET_CACHE_DIR = os.environ.get("BLENDERMCP_CACHE_DIR")  # Default: Blender's user data directory
+ASSET_CACHE_MAX_BYTES = int(os.environ.get("BLENDERMCP_CACHE_MAX_MB", "4096")) * 1024 * 1024
+ASSET_MANIFEST_TTL = 7 * 24 * 3600  # Seconds a cached file listing of an asset stays valid
+ASSET_INDEX_FLUSH_INTERVAL = 60  # Seconds between index writes that only record cache hits
+CATALOG_TTL = 24 * 3600  # Seconds before the asset catalog is revalidated with its ETag
+POLYHAVEN_TYPES = {0: "hdris", 1: "textures", 2: "models"}  # Type codes used in the /assets listing
+
+# Socket protocol: every connection starts with the original bare-JSON protocol.
+# Clients can switch to a framed protocol by sending a "handshake" command first.
+PROTOCOL_VERSION = 2
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024  # Upper bound for a single framed message
+SOCKET_BACKLOG = 64  # Pending connections the OS queues before accept
+
+class ProtocolError(Exception):
+    pass
+
+class MessageCodec:
+    """Splits the byte stream of one connection into JSON commands and encodes responses.
+
+    Framing modes:
+    - "legacy": bare JSON objects back to back (original protocol, default)
+    - "ndjson": one JSON object per line
+    - "length": 4-byte big-endian length prefix followed by UTF-8 JSON
+
+    In the framed modes every message is decoded exactly once, when its last
+    byte has arrived.
+    """
+
+    FRAMINGS = ("length", "ndjson")
+
+    def __init__(self):
+        self.mode = "legacy"
+        self.buffer = bytearray()
+        self._scan = 0  # ndjson: position up to which the buffer holds no newline
+        self._decoder = json.JSONDecoder()
+
+    def switch(self, mode):
+        if mode not in self.FRAMINGS:
+            raise ProtocolError(f"Unsupported framing: {mode}")
+        self.mode = mode
+        self._scan = 0
+
+    def feed(self, data):
+        """Add received bytes; returns a list of (command, error) tuples
+
+        Decoding stops after a handshake command, so bytes that follow it are
+        parsed with the newly negotiated framing.
+        """
+        self.buffer += data
+        if self.mode == "length":
+            return self._feed_length()
+        if self.mode == "ndjson":
+            return self._feed_ndjson()
+        return self._feed_legacy(data)
+
+    def _decode(self, payload):
+        try:
+            command = json.loads(payload)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            return None, f"Invalid JSON message: {str(e)}"
+        if not isinstance(command, dict):
+            return None, "Message must be a JSON object"
+        return command, None
+
+    def _feed_length(self):
+        messages = []
+        while len(self.buffer) >= 4:
+            size = int.from_bytes(self.buffer[:4], "big")
+            if size > MAX_MESSAGE_SIZE:
+                raise ProtocolError(f"Message of {size} bytes exceeds limit of {MAX_MESSAGE_SIZE}")
+            if len(self.buffer) < 4 + size:
+                break
+            command, error = self._decode(bytes(self.buffer[4:4 + size]))
+            del self.buffer[:4 + size]
+            messages.append((command, error))
+            if command and command.get("type") == "handshake":
+                break
+        return messages
+
+    def _feed_ndjson(self):
+        messages = []
+        while True:
+            newline = self.buffer.find(b"\n", self._scan)
+            if newline < 0:
+                self._scan = len(self.buffer)
+                if self._scan > MAX_MESSAGE_SIZE:
+                    raise ProtocolError(f"Line exceeds limit of {MAX_MESSAGE_SIZE} bytes")
+                break
+            line = bytes(self.buffer[:newline])
+            del self.buffer[:newline + 1]
+            self._scan = 0
+            if not line.strip():
+                continue
+            command, error = self._decode(line)
+            messages.append((command, error))
+            if command and command.get("type") == "handshake":
+                break
+        return messages
+
+    def _feed_legacy(self, data):
+        # A complete JSON object ends with "}", so only try to decode once one has arrived
+        if b"}" not in data:
+            if len(self.buffer) > MAX_MESSAGE_SIZE:
+                raise ProtocolError(f"Message exceeds limit of {MAX_MESSAGE_SIZE} bytes")
+            return []
+        # "}" never occurs inside a multi-byte UTF-8 sequence, so this prefix decodes cleanly
+        end = self.buffer.rfind(b"}") + 1
+        try:
+            text = self.buffer[:end].decode("utf-8")
+        except UnicodeDecodeError:
+            raise ProtocolError("Message is not valid UTF-8")
+
+        messages = []
+        pos = 0
+        while True:
+            while pos < len(text) and text[pos].isspace():
+                pos += 1
+            if pos == len(text):
+                break
+            try:
+                command, pos = self._decoder.raw_decode(text, pos)
+            except json.JSONDecodeError:
+                break  # Incomplete data, wait for more
+            if not isinstance(command, dict):
+                messages.append((None, "Message must be a JSON object"))
+                continue
+            messages.append((command, None))
+            if command.get("type") == "handshake":
+                break
+        self.buffer = bytearray(text[pos:].encode("utf-8")) + self.buffer[end:]
+        return messages
+
+    def encode(self, response, mode=None):
+        payload = json.dumps(response).encode("utf-8")
+        mode = mode or self.mode
+        if mode == "length":
+            return len(payload).to_bytes(4, "big") + payload
+        if mode == "ndjson":
+            return payload + b"\n"
+        return payload
+
+# Per-object data that query_scene can return in addition to name and type
+OBJECT_FIELDS = ("transform", "visibility", "bounds", "materials", "mesh")
+QUERY_PAGE_SIZE = 50
+QUERY_MAX_PAGE_SIZE = 500
+
+# Main-thread command queue: lower values run first
+PRIORITY_QUERY = 0
+PRIORITY_DEFAULT = 1
+PRIORITY_HEAVY = 2
+COMMAND_PRIORITIES = {
+    "get_scene_info": PRIORITY_QUERY,
+    "get_object_info": PRIORITY_QUERY,
+    "query_scene": PRIORITY_QUERY,
+    "changes_since": PRIORITY_QUERY,
+    "get_polyhaven_status": PRIORITY_QUERY,
+    "get_hyper3d_status": PRIORITY_QUERY,
+    "get_sketchfab_status": PRIORITY_QUERY,
+    "get_queue_stats": PRIORITY_QUERY,
+    "get_asset_cache_stats": PRIORITY_QUERY,
+    "download_polyhaven_asset": PRIORITY_HEAVY,
+    "import_generated_asset": PRIORITY_HEAVY,
+    "download_sketchfab_model": PRIORITY_HEAVY,
+}
+QUEUE_IDLE_INTERVAL = 0.02  # Seconds between timer ticks while the queue is empty
+INTEGRATION_FLAGS = ("blendermcp_use_polyhaven", "blendermcp_use_hyper3d", "blendermcp_use_sketchfab")
+
+def command_priority(command):
+    """Priority of a command; clients may override it with a "priority" field"""
+    priority = command.get("priority")
+    if isinstance(priority, int) and PRIORITY_QUERY <= priority <= PRIORITY_HEAVY:
+        return priority
+    if command.get("type") == "batch":
+        # A batch is as heavy as its heaviest sub-command
+        commands = command.get("params", {}).get("commands")
+        if isinstance(commands, list) and commands:
+            return max(command_priority(c) if isinstance(c, dict) else PRIORITY_DEFAULT for c in commands)
+    return COMMAND_PRIORITIES.get(command.get("type"), PRIORITY_DEFAULT)
+
+class MainThreadQueue:
+    """Thread-safe priority queue of commands, drained by one persistent Blender timer
+
+    Each tick runs commands until the time budget is used up, then yields so
+    Blender can redraw. A single command that takes longer than the budget
+    still runs to completion; it just ends the tick.
+    """
+
+    def __init__(self, execute, budget=0.02):
+        self.execute = execute
+        self.budget = budget
+        self._heap = []
+        self._lock = threading.Lock()
+        self._seq = itertools.count()  # Keeps FIFO order within a priority
+        self.stats = {}  # Command type -> timings, only touched on the main thread
+        self.dropped = 0  # Commands skipped because their client disconnected
+        # bpy.app.timers compares callbacks by identity, so keep one bound method
+        self._tick_fn = self._tick
+
+    def submit(self, command, reply, cancelled=None):
+        """Queue a command; it is skipped without a reply if cancelled() is true when its turn comes"""
+        entry = (command_priority(command), next(self._seq), time.perf_counter(), command, reply, cancelled)
+        with self._lock:
+            heapq.heappush(self._heap, entry)
+
+    def pending(self):
+        with self._lock:
+            return len(self._heap)
+
+    def start(self):
+        if not bpy.app.timers.is_registered(self._tick_fn):
+            bpy.app.timers.register(self._tick_fn, first_interval=0.0, persistent=True)
+
+    def stop(self):
+        if bpy.app.timers.is_registered(self._tick_fn):
+            bpy.app.timers.unregister(self._tick_fn)
+        with self._lock:
+            entries, self._heap = self._heap, []
+        for entry in entries:
+            try:
+                entry[4]({"status": "error", "message": "Server stopped before the command ran"})
+            except Exception:
+                pass
+
+    def _tick(self):
+        deadline = time.perf_counter() + self.budget
+        while True:
+            with self._lock:
+                if not self._heap:
+                    return QUEUE_IDLE_INTERVAL
+                _, _, enqueued, command, reply, cancelled = heapq.heappop(self._heap)
+
+            if cancelled is not None and cancelled():
+                self.dropped += 1
+                continue
+
+            started = time.perf_counter()
+            response = self.execute(command)
+            finished = time.perf_counter()
+            self._record(command.get("type"), started - enqueued, finished - started)
+            try:
+                reply(response)
+            except Exception:
+                print("Failed to send response - client disconnected")
+
+            if finished >= deadline:
+                return 0.0  # Give Blender a chance to redraw, then continue right away
+
+    def _record(self, cmd_type, wait, duration):
+        entry = self.stats.setdefault(cmd_type, {"count": 0, "wait_total": 0.0, "wait_max": 0.0,
+                                                 "exec_total": 0.0, "exec_max": 0.0})
+        entry["count"] += 1
+        entry["wait_total"] += wait
+        entry["wait_max"] = max(entry["wait_max"], wait)
+        entry["exec_total"] += duration
+        entry["exec_max"] = max(entry["exec_max"], duration)
+
+    def summary(self):
+        return {
+            "pending": self.pending(),
+            "dropped": self.dropped,
+            "budget_ms": round(self.budget * 1000, 1),
+            "commands": {
+                cmd_type: {
+                    "count": e["count"],
+                    "avg_wait_ms": round(e["wait_total"] / e["count"] * 1000, 2),
+                    "max_wait_ms": round(e["wait_max"] * 1000, 2),
+                    "avg_exec_ms": round(e["exec_total"] / e["count"] * 1000, 2),
+                    "max_exec_ms": round(e["exec_max"] * 1000, 2),
+                }
+                for cmd_type, e in sorted(self.stats.items(), key=lambda x: str(x[0]))
+            },
+        }
+
+# Scene change tracking
+CHANGE_EVENT_INTERVAL = 0.1  # Seconds over which depsgraph updates are merged into one event
+MAX_TRACKED_CHANGES = 20000  # Older change records are dropped; clients then have to resync
+
+class SceneChangeTracker:
+    """Records which objects changed at which scene version and streams change events
+
+    Every depsgraph update that touches objects bumps the version. Objects are
+    identified by name. Subscribers receive the merged changes of the last
+    CHANGE_EVENT_INTERVAL as one event. All recording happens on the main
+    thread; the lock only protects the subscriber table.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.floor = 0  # changes_since() below this version can not be answered
+        self.changes = {}  # Object name -> latest change record
+        self.known = set()  # Object names in the scene at the last update
+        self.pending = {}  # Changes not yet sent to subscribers
+        self.subscribers = {}  # Key (connection) -> send function
+        self._lock = threading.Lock()
+        self._handlers = None
+        # bpy.app.timers compares callbacks by identity, so keep one bound method
+        self._flush_fn = self._flush
+
+    def start(self):
+        if self._handlers:
+            return
+        self.known = {obj.name for obj in bpy.context.scene.objects}
+
+        # persistent keeps the handlers registered when another .blend file is loaded
+        @bpy.app.handlers.persistent
+        def on_depsgraph_update(scene, depsgraph):
+            self.on_depsgraph_update(scene, depsgraph)
+
+        @bpy.app.handlers.persistent
+        def on_load(*args):
+            self.reset()
+
+        self._handlers = (on_depsgraph_update, on_load)
+        bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
+        bpy.app.handlers.load_post.append(on_load)
+
+    def stop(self):
+        if not self._handlers:
+            return
+        on_depsgraph_update, on_load = self._handlers
+        with suppress(ValueError):
+            bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
+        with suppress(ValueError):
+            bpy.app.handlers.load_post.remove(on_load)
+        self._handlers = None
+        if bpy.app.timers.is_registered(self._flush_fn):
+            bpy.app.timers.unregister(self._flush_fn)
+        with self._lock:
+            self.subscribers.clear()
+
+    def on_depsgraph_update(self, scene, depsgraph):
+        updated = {}
+        for update in depsgraph.updates:
+            if isinstance(update.id, bpy.types.Object):
+                flags = updated.setdefault(update.id.name, [False, False])
+                flags[0] |= update.is_updated_transform
+                flags[1] |= update.is_updated_geometry
+
+        # Additions and deletions are not reported as updates, so compare the object names
+        names = None
+        if len(scene.objects) != len(self.known) or any(name not in self.known for name in updated):
+            names = {obj.name for obj in scene.objects}
+        if not updated and names is None:
+            return
+
+        self.version += 1
+        for name, (transform, geometry) in updated.items():
+            self._record(name, "updated" if name in self.known else "added", transform, geometry)
+        if names is not None:
+            for name in names - self.known:
+                if name not in updated:
+                    self._record(name, "added")
+            for name in self.known - names:
+                self._record(name, "removed")
+            self.known = names
+
+        if len(self.changes) > MAX_TRACKED_CHANGES:
+            self._prune()
+        if self.subscribers and not bpy.app.timers.is_registered(self._flush_fn):
+            bpy.app.timers.register(self._flush_fn, first_interval=CHANGE_EVENT_INTERVAL)
+
+    def _record(self, name, change, transform=False, geometry=False):
+        record = {"name": name, "change": change}
+        if transform:
+            record["transform"] = True
+        if geometry:
+            record["geometry"] = True
+        self.changes[name] = self._merge(self.changes.get(name), dict(record, version=self.version))
+        if self.subscribers:
+            self.pending[name] = self._merge(self.pending.get(name), record)
+
+    @staticmethod
+    def _merge(previous, record):
+        """Combine two changes of one object; flags are kept, "added" stays until removed"""
+        if not previous or previous["change"] == "removed" or record["change"] == "removed":
+            return record
+        merged = dict(previous, **record)
+        if previous["change"] == "added":
+            merged["change"] = "added"
+        return merged
+
+    def _prune(self):
+        """Drop the oldest half of the change records"""
+        versions = sorted(record["version"] for record in self.changes.values())
+        self.floor = versions[len(versions) // 2]
+        self.changes = {name: r for name, r in self.changes.items() if r["version"] > self.floor}
+
+    def reset(self):
+        """A different file was loaded: everything a client knows is stale"""
+        self.version += 1
+        self.floor = self.version
+        self.changes = {}
+        self.pending = {}
+        self.known = {obj.name for obj in bpy.context.scene.objects}
+        self._publish({"event": "scene_reset", "version": self.version})
+
+    def since(self, version):
+        if version < self.floor:
+            return {"version": self.version, "resync": True, "changes": []}
+        changes = [
+            {k: v for k, v in record.items() if k != "version"}
+            for record in sorted(self.changes.values(), key=lambda r: r["version"])
+            if record["version"] > version
+        ]
+        return {"version": self.version, "resync": False, "changes": changes}
+
+    def subscribe(self, key, send):
+        with self._lock:
+            self.subscribers[key] = send
+            return self.version
+
+    def unsubscribe(self, key):
+        with self._lock:
+            return self.subscribers.pop(key, None) is not None
+
+    def _flush(self):
+        if self.pending:
+            changes, self.pending = list(self.pending.values()), {}
+            self._publish({"event": "scene_changed", "version": self.version, "changes": changes})
+        return None
+
+    def _publish(self, event):
+        with self._lock:
+            subscribers = list(self.subscribers.values())
+        for send in subscribers:
+            try:
+                send(event)
+            except Exception:
+                pass
+
+class ClientConnection:
+    """State of one client socket inside the selector loop
+
+    Responses are produced on Blender's main thread, so they are appended to
+    the output buffer under a lock and written by the I/O thread. Commands of
+    one connection reach the main-thread queue one at a time, in the order
+    they were sent; priorities only reorder commands of different clients.
+    """
+
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        self.codec = MessageCodec()
+        self.outbuf = bytearray()
+        self.lock = threading.Lock()
+        self.closed = False
+        self.writing = False  # Registered for EVENT_WRITE
+        self.backlog = deque()  # Commands waiting for the previous one to finish
+        self.in_flight = False  # A command of this connection is queued or running
+        self.order_lock = threading.Lock()
+
+class AssetCache:
+    """Content-addressed, size-bounded on-disk cache for downloaded asset files
+
+    Files are stored under their MD5, which Polyhaven publishes for every
+    file, and verified against it when downloaded. A JSON index keeps the
+    size, last use and origin (asset id, resolution, format) of each file
+    plus the file listings of recently used assets, so repeat imports need
+    no network access. The least recently used files are evicted once the
+    cache grows beyond max_bytes.
+    """
+
+    def __init__(self, root=None, max_bytes=ASSET_CACHE_MAX_BYTES):
+        self.root = root
+        self.index = None  # Loaded on first use
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "corrupt": 0}
+        self._lock = threading.Lock()
+        self.max_bytes = max_bytes
+        self._dirty = False  # Access times changed since the index was last written
+        self._saved_at = 0.0
+
+    def _ensure_loaded(self):
+        if self.index is not None:
+            return
+        if not self.root:
+            try:
+                self.root = bpy.utils.user_resource('DATAFILES', path="blendermcp_cache", create=True)
+            except Exception:
+                self.root = os.path.join(tempfile.gettempdir(), "blendermcp_cache")
+        os.makedirs(os.path.join(self.root, "tmp"), exist_ok=True)
+        self.index = {"files": {}, "urls": {}, "manifests": {}}
+        self._saved_at = time.monotonic()
+        with suppress(Exception):
+            with open(os.path.join(self.root, "index.json"), encoding="utf-8") as f:
+                self.index.update(json.load(f))
+        # The limit may be lower than when the index was written
+        if self._evict():
+            self._save()
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value):
+        """Changing the limit evicts right away if the cache is already loaded"""
+        with self._lock:
+            self._max_bytes = value
+            if self.index is not None and self._evict():
+                self._save()
+
+    def directory(self):
+        """Cache root; resolve it on the main thread before workers use the cache"""
+        with self._lock:
+            self._ensure_loaded()
+            return self.root
+
+    def _save(self):
+        path = os.path.join(self.root, "index.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(path + ".tmp", path)
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    def flush(self):
+        """Write access times recorded by cache hits that are not on disk yet"""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _blob_path(self, digest, extension):
+        return os.path.join(self.root, "objects", digest[:2], f"{digest}.{extension}")
+
+    def manifest(self, asset_id, fetch):
+        """File listing of an asset, fetched with fetch() when missing or older than the TTL"""
+        with self._lock:
+            self._ensure_loaded()
+            entry = self.index["manifests"].get(asset_id)
+            if entry and time.time() - entry["fetched"] < ASSET_MANIFEST_TTL:
+                return entry["data"]
+
+        data = fetch()
+        with self._lock:
+            self.index["manifests"][asset_id] = {"fetched": time.time(), "data": data}
+            self._save()
+        return data
+
+    def fetch(self, file_info, asset_id, resolution, file_format):
+        """Local path of a file described by a Polyhaven file entry (url, md5, size)
+
+        Returns (path, from_cache). Cached files are checked against their
+        recorded size; a missing or damaged file is downloaded again.
+        """
+        url = file_info["url"]
+        with self._lock:
+            self._ensure_loaded()
+            digest = file_info.get("md5") or self.index["urls"].get(url)
+            entry = self.index["files"].get(digest) if digest else None
+            if entry:
+                path = self._blob_path(digest, entry["extension"])
+                if os.path.isfile(path) and os.path.getsize(path) == entry["size"]:
+                    entry["last_used"] = time.time()
+                    self.counters["hits"] += 1
+                    # Hits only move access times; write them in batches instead of on every hit
+                    self._dirty = True
+                    if time.monotonic() - self._saved_at >= ASSET_INDEX_FLUSH_INTERVAL:
+                        self._save()
+                    return path, True
+                self.counters["corrupt"] += 1
+                self._drop(digest)
+            self.counters["misses"] += 1
+
+        extension = os.path.splitext(url.split("?")[0])[1].lstrip(".") or file_format
+        digest, size = self._download(url, file_info.get("md5"), file_info.get("size"), extension)
+
+        with self._lock:
+            self.index["files"][digest] = {
+                "size": size,
+                "extension": extension,
+                "last_used": time.time(),
+                "asset_id": asset_id,
+                "resolution": resolution,
+                "format": file_format,
+                "url": url,
+            }
+            self.index["urls"][url] = digest
+            self._evict()
+            self._save()
+            return self._blob_path(digest, extension), False
+
+    def _download(self, url, expected_md5, expected_size, extension):
+        """Stream a file into the cache, verifying size and MD5 before it becomes visible"""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.join(self.root, "tmp"))
+        os.close(fd)
+        md5 = hashlib.md5()
+        try:
+            size = stream_download(url, tmp_path, headers=REQ_HEADERS, on_chunk=md5.update)
+
+            digest = md5.hexdigest()
+            if expected_md5 and digest != expected_md5:
+                raise ValueError(f"Checksum mismatch for {url}")
+            if expected_size and size != expected_size:
+                raise ValueError(f"Size mismatch for {url}: expected {expected_size}, got {size}")
+
+            path = self._blob_path(digest, extension)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+            return digest, size
+        finally:
+            with suppress(FileNotFoundError):
+                os.remove(tmp_path)
+
+    def _drop(self, digest):
+        entry = self.index["files"].pop(digest, None)
+        if entry:
+            with suppress(FileNotFoundError):
+                os.remove(self._blob_path(digest, entry["extension"]))
+            self.index["urls"].pop(entry.get("url"), None)
+
+    def _evict(self):
+        """Drop least recently used files until the cache fits; returns the number dropped"""
+        total = sum(e["size"] for e in self.index["files"].values())
+        evicted = 0
+        for digest, entry in sorted(self.index["files"].items(), key=lambda x: x[1]["last_used"]):
+            if total <= self._max_bytes:
+                break
+            total -= entry["size"]
+            self._drop(digest)
+            evicted += 1
+        self.counters["evictions"] += evicted
+        return evicted
+
+    @staticmethod
+    def materialize(path, dest):
+        """Make a cached file available under another name, as a hard link where possible"""
+        os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+        with suppress(FileNotFoundError):
+            os.remove(dest)
+        try:
+            os.link(path, dest)
+        except OSError:
+            shutil.copyfile(path, dest)
+
+    def stats(self, verify=False):
+        """Cache size and counters; verify re-hashes every file and drops damaged ones"""
+        with self._lock:
+            self._ensure_loaded()
+            if verify:
+                for digest, entry in list(self.index["files"].items()):
+                    path = self._blob_path(digest, entry["extension"])
+                    try:
+                        with open(path, "rb") as f:
+                            intact = hashlib.file_digest(f, "md5").hexdigest() == digest
+                    except (OSError, AttributeError):
+                        intact = os.path.isfile(path) and os.path.getsize(path) == entry["size"]
+                    if not intact:
+                        self.counters["corrupt"] += 1
+                        self._drop(digest)
+            if self._evict() or verify:
+                self._save()
+
+            files = self.index["files"].values()
+            return {
+                "directory": self.root,
+                "files": len(files),
+                "size_bytes": sum(e["size"] for e in files),
+                "max_bytes": self.max_bytes,
+                "assets": len({e["asset_id"] for e in files}),
+                "manifests": len(self.index["manifests"]),
+                **self.counters,
+            }
+
+class PolyhavenCatalog:
+    """Local copy of the Polyhaven asset listing with an in-memory search index
+
+    The listing is stored next to the asset cache and revalidated with its
+    ETag once CATALOG_TTL has passed; when Polyhaven can not be reached, the
+    stored copy keeps being used. Assets are indexed by type, category and
+    the words of their id, name, tags and categories.
+    """
+
+    def __init__(self, asset_cache):
+        self.asset_cache = asset_cache
+        self.assets = None
+        self.fetched = 0
+        self.etag = None
+        self.by_type = {}
+        self.by_category = {}
+        self.by_token = {}
+        self.tokens = []  # Sorted, for prefix lookups
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def tokenize(text):
+        return [t for t in re.split(r"[^a-z0-9]+", str(text).lower()) if t]
+
+    def _path(self):
+        return os.path.join(self.asset_cache.directory(), "catalog.json")
+
+    def ensure_fresh(self):
+        """Load the stored catalog and refresh it when it is older than the TTL"""
+        with self._lock:
+            if self.assets is None:
+                with suppress(Exception):
+                    with open(self._path(), encoding="utf-8") as f:
+                        stored = json.load(f)
+                    self._build(stored["assets"])
+                    self.fetched, self.etag = stored["fetched"], stored.get("etag")
+            if self.assets is not None and time.time() - self.fetched < CATALOG_TTL:
+                return
+
+            headers = dict(REQ_HEADERS)
+            if self.etag and self.assets is not None:
+                headers["If-None-Match"] = self.etag
+            try:
+                response = HTTP_SESSION.get(f"{POLYHAVEN_API}/assets", headers=headers, timeout=30)
+            except requests.exceptions.RequestException:
+                if self.assets is None:
+                    raise
+                print("Polyhaven unreachable, using the stored catalog")
+                self.fetched = time.time() - CATALOG_TTL + 300  # Try again in 5 minutes
+                return
+
+            if response.status_code == 304:
+                self.fetched = time.time()
+            elif response.status_code == 200:
+                self._build(response.json())
+                self.fetched, self.etag = time.time(), response.headers.get("ETag")
+            elif self.assets is None:
+                raise ValueError(f"API request failed with status code {response.status_code}")
+            else:
+                self.fetched = time.time() - CATALOG_TTL + 300  # Keep the stored copy, try again in 5 minutes
+                return
+
+            with open(self._path() + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"fetched": self.fetched, "etag": self.etag, "assets": self.assets}, f)
+            os.replace(self._path() + ".tmp", self._path())
+
+    def _build(self, assets):
+        by_type, by_category, by_token = {}, {}, {}
+        for asset_id, asset in assets.items():
+            by_type.setdefault(POLYHAVEN_TYPES.get(asset.get("type")), set()).add(asset_id)
+            for category in asset.get("categories", []):
+                by_category.setdefault(category, set()).add(asset_id)
+            words = [asset_id, asset.get("name", "")] + asset.get("tags", []) + asset.get("categories", [])
+            for token in self.tokenize(" ".join(words)):
+                by_token.setdefault(token, set()).add(asset_id)
+        self.assets = assets
+        self.by_type, self.by_category, self.by_token = by_type, by_category, by_token
+        self.tokens = sorted(by_token)
+
+    def categories(self, asset_type):
+        """Category -> asset count, like Polyhaven's /categories endpoint"""
+        self.ensure_fresh()
+        ids = set(self.assets) if asset_type == "all" else self.by_type.get(asset_type, set())
+        counts = {"all": len(ids)}
+        for category, members in self.by_category.items():
+            count = len(members & ids)
+            if count:
+                counts[category] = count
+        return dict(sorted(counts.items(), key=lambda x: -x[1]))
+
+    def _score(self, asset_id, token, exact_ids):
+        """How well an asset matches one query word: name > tag/category > prefix"""
+        if asset_id not in exact_ids:
+            return 1
+        asset = self.assets[asset_id]
+        if token in self.tokenize(asset.get("name", "")) or token in self.tokenize(asset_id):
+            return 3
+        return 2
+
+    def search(self, asset_type=None, categories=None, query=None, cursor=None, limit=20):
+        """Ranked, paginated search; returns (ranked page of ids, total, next cursor)"""
+        self.ensure_fresh()
+        candidates = set(self.assets) if not asset_type or asset_type == "all" else set(self.by_type.get(asset_type, ()))
+        if isinstance(categories, str):
+            categories = [c for c in categories.split(",") if c]
+        for category in categories or []:
+            candidates &= self.by_category.get(category, set())
+
+        scores = dict.fromkeys(candidates, 0)
+        for token in self.tokenize(query or ""):
+            # Every query word has to match an indexed word exactly or as a prefix
+            start = bisect.bisect_left(self.tokens, token)
+            prefix_ids = set()
+            for indexed in itertools.islice(self.tokens, start, None):
+                if not indexed.startswith(token):
+                    break
+                prefix_ids |= self.by_token[indexed]
+            exact_ids = self.by_token.get(token, set())
+            scores = {i: score + self._score(i, token, exact_ids) for i, score in scores.items() if i in prefix_ids}
+
+        ranked = sorted(scores, key=lambda i: (-scores[i], -self.assets[i].get("download_count", 0), i))
+        offset = int(cursor or 0)
+        page = ranked[offset:offset + limit]
+        next_cursor = str(offset + limit) if offset + limit < len(ranked) else None
+        return page, len(ranked), next_cursor
+
 class BlenderMCPServer:
-    def __init__(self, host='localhost', port=9876):
+    def __init__(self, host='localhost', port=9876, tick_budget=0.02):
         self.host = host
         self.port = port
         self.running = False
         self.socket = None
         self.server_thread = None
+        self.selector = None
+        self._wakeup = None  # Socket pair to interrupt select() from other threads
+        self._dirty = set()  # Connections with output waiting to be flushed
+        self._dirty_lock = threading.Lock()
+        self.command_queue = MainThreadQueue(self.execute_command, budget=tick_budget)
+        self.scene_tracker = SceneChangeTracker()
+        self.asset_cache = AssetCache(ASSET_CACHE_DIR, ASSET_CACHE_MAX_BYTES)
+        self.polyhaven_catalog = PolyhavenCatalog(self.asset_cache)
+        self.download_pool = None  # Worker threads for file downloads
+        self.prefetch_pool = None  # Worker threads that prepare commands before they reach the main thread
+        self.enabled_flags = {}  # Snapshot of INTEGRATION_FLAGS, readable from worker threads
+
+        # Commands answered by the I/O thread: (connection, command, send)
+        self.io_handlers = {
+            "handshake": self._handshake,
+            "subscribe": self._subscription,
+            "unsubscribe": self._subscription,
+            "get_download_progress": self._download_progress,
+        }
+
+        # Network work that can run before a command is queued for the main thread
+        self.prefetchers = {
+            "download_polyhaven_asset": (self._prefetch_polyhaven_asset, "blendermcp_use_polyhaven"),
+            "search_polyhaven_assets": (self._prefetch_polyhaven_catalog, "blendermcp_use_polyhaven"),
+            "get_polyhaven_categories": (self._prefetch_polyhaven_catalog, "blendermcp_use_polyhaven"),
+        }
+
+        # Command table: type -> (handler, scene flag that has to be enabled or None)
+        self.handlers = {
+            "get_scene_info": (self.get_scene_info, None),
+            "get_object_info": (self.get_object_info, None),
+            "query_scene": (self.query_scene, None),
+            "changes_since": (self.changes_since, None),
+            "get_viewport_screenshot": (self.get_viewport_screenshot, None),
+            "execute_code": (self.execute_code, None),
+            "batch": (self.execute_batch, None),
+            "get_queue_stats": (self.get_queue_stats, None),
+            "get_asset_cache_stats": (self.get_asset_cache_stats, None),
+            "get_polyhaven_status": (self.get_polyhaven_status, None),
+            "get_hyper3d_status": (self.get_hyper3d_status, None),
+            "get_sketchfab_status": (self.get_sketchfab_status, None),
+            "get_polyhaven_categories": (self.get_polyhaven_categories, "blendermcp_use_polyhaven"),
+            "search_polyhaven_assets": (self.search_polyhaven_assets, "blendermcp_use_polyhaven"),
+            "download_polyhaven_asset": (self.download_polyhaven_asset, "blendermcp_use_polyhaven"),
+            "set_texture": (self.set_texture, "blendermcp_use_polyhaven"),
+            "create_rodin_job": (self.create_rodin_job, "blendermcp_use_hyper3d"),
+            "poll_rodin_job_status": (self.poll_rodin_job_status, "blendermcp_use_hyper3d"),
+            "import_generated_asset": (self.import_generated_asset, "blendermcp_use_hyper3d"),
+            "search_sketchfab_models": (self.search_sketchfab_models, "blendermcp_use_sketchfab"),
+            "download_sketchfab_model": (self.download_sketchfab_model, "blendermcp_use_sketchfab"),
+        }
 
     def start(self):
         if self.running:
@@ -52,13 +986,31 @@ class BlenderMCPServer:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.socket.bind((self.host, self.port))
-            self.socket.listen(1)
+            self.socket.listen(SOCKET_BACKLOG)
+            self.socket.setblocking(False)
+
+            # One selector multiplexes the listening socket and all clients
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.socket, selectors.EVENT_READ, "accept")
+            self._wakeup = socket.socketpair()
+            for sock in self._wakeup:
+                sock.setblocking(False)
+            self.selector.register(self._wakeup[0], selectors.EVENT_READ, "wakeup")
 
             # Start server thread
             self.server_thread = threading.Thread(target=self._server_loop)
             self.server_thread.daemon = True
             self.server_thread.start()
 
+            self.download_pool = ThreadPoolExecutor(DOWNLOAD_WORKERS, thread_name_prefix="blendermcp-download")
+            self.prefetch_pool = ThreadPoolExecutor(2, thread_name_prefix="blendermcp-prefetch")
+            self._snapshot_flags()
+            self.asset_cache.directory()  # Resolves the cache location while on the main thread
+
+            # One persistent timer executes all commands on the main thread
+            self.command_queue.start()
+            self.scene_tracker.start()
+
             print(f"BlenderMCP server started on {self.host}:{self.port}")
         except Exception as e:
             print(f"Failed to start server: {str(e)}")
@@ -66,122 +1018,307 @@ class BlenderMCPServer:
 
     def stop(self):
         self.running = False
-
-        # Close socket
-        if self.socket:
-            try:
-                self.socket.close()
-            except:
-                pass
-            self.socket = None
-
-        # Wait for thread to finish
+        self.command_queue.stop()
+        self.scene_tracker.stop()
+        with suppress(Exception):
+            self.asset_cache.flush()
+        for pool in (self.prefetch_pool, self.download_pool):
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self.prefetch_pool = self.download_pool = None
+
+        # Wake the I/O thread so it exits right away and closes all sockets
         if self.server_thread:
+            self._wake()
             try:
                 if self.server_thread.is_alive():
                     self.server_thread.join(timeout=1.0)
             except:
                 pass
             self.server_thread = None
+        else:
+            self._close_sockets()
 
         print("BlenderMCP server stopped")
 
+    def _wake(self):
+        try:
+            self._wakeup[1].send(b"\0")
+        except (BlockingIOError, OSError, TypeError):
+            pass  # A wakeup is already pending or the server is shutting down
+
+    def _close_sockets(self):
+        if self.selector:
+            for key in list(self.selector.get_map().values()):
+                if isinstance(key.data, ClientConnection):
+                    key.data.closed = True
+                try:
+                    key.fileobj.close()
+                except:
+                    pass
+            self.selector.close()
+            self.selector = None
+        for sock in (self.socket, *(self._wakeup or ())):
+            if sock:
+                try:
+                    sock.close()
+                except:
+                    pass
+        self.socket = None
+        self._wakeup = None
+
     def _server_loop(self):
-        """Main server loop in a separate thread"""
+        """Single I/O thread: accepts clients, reads commands and writes responses"""
         print("Server thread started")
-        self.socket.settimeout(1.0)  # Timeout to allow for stopping
 
-        while self.running:
+        try:
+            while self.running:
+                for key, mask in self.selector.select():
+                    if key.data == "accept":
+                        self._accept()
+                    elif key.data == "wakeup":
+                        try:
+                            while key.fileobj.recv(4096):
+                                pass
+                        except BlockingIOError:
+                            pass
+                    else:
+                        if mask & selectors.EVENT_READ:
+                            self._read(key.data)
+                        if mask & selectors.EVENT_WRITE:
+                            self._flush(key.data)
+
+                with self._dirty_lock:
+                    dirty, self._dirty = self._dirty, set()
+                for conn in dirty:
+                    self._flush(conn)
+        except Exception as e:
+            print(f"Error in server loop: {str(e)}")
+            traceback.print_exc()
+        finally:
+            self._close_sockets()
+
+        print("Server thread stopped")
+
+    def _accept(self):
+        while True:
             try:
-                # Accept new connection
-                try:
-                    client, address = self.socket.accept()
-                    print(f"Connected to client: {address}")
-
-                    # Handle client in a separate thread
-                    client_thread = threading.Thread(
-                        target=self._handle_client,
-                        args=(client,)
-                    )
-                    client_thread.daemon = True
-                    client_thread.start()
-                except socket.timeout:
-                    # Just check running condition
-                    continue
-                except Exception as e:
-                    print(f"Error accepting connection: {str(e)}")
-                    time.sleep(0.5)
+                client, address = self.socket.accept()
+            except (BlockingIOError, InterruptedError):
+                return
             except Exception as e:
-                print(f"Error in server loop: {str(e)}")
-                if not self.running:
-                    break
-                time.sleep(0.5)
+                print(f"Error accepting connection: {str(e)}")
+                return
+            print(f"Connected to client: {address}")
+            client.setblocking(False)
+            self.selector.register(client, selectors.EVENT_READ, ClientConnection(client, address))
 
-        print("Server thread stopped")
+    def _read(self, conn):
+        try:
+            data = conn.sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except Exception as e:
+            print(f"Error receiving data: {str(e)}")
+            self._close(conn)
+            return
+        if not data:
+            print("Client disconnected")
+            self._close(conn)
+            return
 
-    def _handle_client(self, client):
-        """Handle connected client"""
-        print("Client handler started")
-        client.settimeout(None)  # No timeout
-        buffer = b''
+        def send(response, mode=None):
+            self._send(conn, response, mode)
 
         try:
-            while self.running:
-                # Receive data
-                try:
-                    data = client.recv(8192)
-                    if not data:
-                        print("Client disconnected")
-                        break
+            messages = conn.codec.feed(data)
+            while messages:
+                for command, error in messages:
+                    if error:
+                        send({"status": "error", "message": error})
+                    elif command.get("type") in self.io_handlers:
+                        # Connection-level commands never touch bpy and are answered right away
+                        self.io_handlers[command["type"]](conn, command, send)
+                    else:
+                        self._schedule_command(conn, command, send, conn.codec.mode)
+                # Bytes after a handshake are parsed with the new framing
+                messages = conn.codec.feed(b"")
+        except ProtocolError as e:
+            print(f"Protocol error: {str(e)}")
+            send({"status": "error", "message": str(e)})
+            self._flush(conn)
+            self._close(conn)
+
+    def _send(self, conn, response, mode=None):
+        """Queue a response for a client; safe to call from any thread"""
+        if conn.closed:
+            return
+        payload = conn.codec.encode(response, mode)
+        with conn.lock:
+            conn.outbuf += payload
+        with self._dirty_lock:
+            self._dirty.add(conn)
+        self._wake()
+
+    def _flush(self, conn):
+        if conn.closed:
+            return
+        with conn.lock:
+            try:
+                while conn.outbuf:
+                    sent = conn.sock.send(conn.outbuf)
+                    del conn.outbuf[:sent]
+            except (BlockingIOError, InterruptedError):
+                pass
+            except Exception:
+                print("Failed to send response - client disconnected")
+                conn.outbuf.clear()
+                self._close(conn)
+                return
+            pending = bool(conn.outbuf)
 
-                    buffer += data
-                    try:
-                        # Try to parse command
-                        command = json.loads(buffer.decode('utf-8'))
-                        buffer = b''
+        # Only watch for writability while output is stuck in the buffer
+        if pending != conn.writing:
+            events = selectors.EVENT_READ | (selectors.EVENT_WRITE if pending else 0)
+            self.selector.modify(conn.sock, events, conn)
+            conn.writing = pending
 
-                        # Execute command in Blender's main thread
-                        def execute_wrapper():
-                            try:
-                                response = self.execute_command(command)
-                                response_json = json.dumps(response)
-                                try:
-                                    client.sendall(response_json.encode('utf-8'))
-                                except:
-                                    print("Failed to send response - client disconnected")
-                            except Exception as e:
-                                print(f"Error executing command: {str(e)}")
-                                traceback.print_exc()
-                                try:
-                                    error_response = {
-                                        "status": "error",
-                                        "message": str(e)
-                                    }
-                                    client.sendall(json.dumps(error_response).encode('utf-8'))
-                                except:
-                                    pass
-                            return None
-
-                        # Schedule execution in main thread
-                        bpy.app.timers.register(execute_wrapper, first_interval=0.0)
-                    except json.JSONDecodeError:
-                        # Incomplete data, wait for more
-                        pass
+    def _close(self, conn):
+        if conn.closed:
+            return
+        conn.closed = True
+        self.scene_tracker.unsubscribe(conn)
+        with conn.order_lock:
+            conn.backlog.clear()  # Nobody is left to read the responses
+        try:
+            self.selector.unregister(conn.sock)
+        except Exception:
+            pass
+        try:
+            conn.sock.close()
+        except:
+            pass
+
+    def _handshake(self, conn, command, send):
+        """Negotiate the framing; the reply still uses the framing the client sent it with"""
+        codec = conn.codec
+        params = command.get("params", {})
+        requested = params.get("framing", list(MessageCodec.FRAMINGS))
+        if isinstance(requested, str):
+            requested = [requested]
+        framing = next((f for f in requested if f in MessageCodec.FRAMINGS), None)
+
+        response = {
+            "status": "success",
+            "result": {
+                "protocol_version": PROTOCOL_VERSION,
+                "framing": framing or codec.mode,
+                "max_message_size": MAX_MESSAGE_SIZE,
+            },
+        }
+        if framing is None:
+            response = {"status": "error", "message": f"No supported framing in {requested}, choose from {list(MessageCodec.FRAMINGS)}"}
+        if "id" in command:
+            response["id"] = command["id"]
+        send(response)
+        if framing:
+            codec.switch(framing)
+
+    def _download_progress(self, conn, command, send):
+        """Running downloads; answered by the I/O thread even while the main thread is busy"""
+        response = {"status": "success", "result": {"downloads": DOWNLOADS.snapshot()}}
+        if "id" in command:
+            response["id"] = command["id"]
+        send(response)
+
+    def _subscription(self, conn, command, send):
+        """Start or stop streaming scene change events to this connection
+
+        Events have an "event" key instead of "status", so clients can tell
+        them apart from command responses.
+        """
+        if command.get("type") == "subscribe":
+            mode = conn.codec.mode
+            version = self.scene_tracker.subscribe(conn, lambda event: send(event, mode))
+            response = {"status": "success", "result": {"subscribed": True, "version": version}}
+        else:
+            self.scene_tracker.unsubscribe(conn)
+            response = {"status": "success", "result": {"subscribed": False}}
+        if "id" in command:
+            response["id"] = command["id"]
+        send(response)
+
+    def _schedule_command(self, conn, command, send, mode):
+        """Queue a command for Blender's main thread; the response is sent when it ran
+
+        The framing is captured at scheduling time so a later handshake on the
+        same connection does not change how this response is encoded. Commands
+        may carry an "id" that is echoed back, which lets clients pipeline.
+        """
+        def reply(response):
+            if "id" in command:
+                response["id"] = command["id"]
+            try:
+                send(response, mode)
+            finally:
+                self._advance(conn, finished=True)
+
+        entry = {"command": command, "reply": reply, "ready": True}
+
+        prefetch, flag = self.prefetchers.get(command.get("type"), (None, None))
+        if prefetch and self.prefetch_pool and self.enabled_flags.get(flag):
+            # Downloads happen here, off the main thread and possibly while
+            # earlier commands of the connection still run; the handler then
+            # finds everything in the cache. If prefetching fails the handler
+            # simply retries and reports the error.
+            def run():
+                if conn.closed:
+                    return
+                try:
+                    prefetch(**command.get("params", {}))
                 except Exception as e:
-                    print(f"Error receiving data: {str(e)}")
-                    break
-        except Exception as e:
-            print(f"Error in client handler: {str(e)}")
-        finally:
+                    print(f"Prefetch for {command.get('type')} failed: {str(e)}")
+                entry["ready"] = True
+                self._advance(conn)
+
             try:
-                client.close()
-            except:
-                pass
-            print("Client handler stopped")
+                entry["ready"] = False
+                self.prefetch_pool.submit(run)
+            except RuntimeError:
+                entry["ready"] = True  # Pool is shutting down
+
+        with conn.order_lock:
+            conn.backlog.append(entry)
+        self._advance(conn)
+
+    def _advance(self, conn, finished=False):
+        """Hand the next command of a connection to the main-thread queue
+
+        Only one command per connection is queued at a time, and only once
+        its prefetch is done, so later commands can never overtake it.
+        """
+        with conn.order_lock:
+            if finished:
+                conn.in_flight = False
+            if not self.running or conn.closed:
+                conn.backlog.clear()
+                return
+            if conn.in_flight or not conn.backlog or not conn.backlog[0]["ready"]:
+                return
+            entry = conn.backlog.popleft()
+            conn.in_flight = True
+        # A queued command of a client that disconnects meanwhile is skipped
+        self.command_queue.submit(entry["command"], entry["reply"], cancelled=lambda: conn.closed)
+
+    def _snapshot_flags(self):
+        """Remember which integrations are enabled; must run on the main thread"""
+        scene = bpy.context.scene
+        self.enabled_flags = {flag: bool(getattr(scene, flag, False)) for flag in INTEGRATION_FLAGS}
 
     def execute_command(self, command):
         """Execute a command in the main Blender thread"""
         try:
+            self._snapshot_flags()
             return self._execute_command_internal(command)
 
         except Exception as e:
@@ -194,49 +1331,11 @@ class BlenderMCPServer:
         cmd_type = command.get("type")
         params = command.get("params", {})
 
-        # Add a handler for checking PolyHaven status
-        if cmd_type == "get_polyhaven_status":
-            return {"status": "success", "result": self.get_polyhaven_status()}
-
-        # Base handlers that are always available
-        handlers = {
-            "get_scene_info": self.get_scene_info,
-            "get_object_info": self.get_object_info,
-            "get_viewport_screenshot": self.get_viewport_screenshot,
-            "execute_code": self.execute_code,
-            "get_polyhaven_status": self.get_polyhaven_status,
-            "get_hyper3d_status": self.get_hyper3d_status,
-            "get_sketchfab_status": self.get_sketchfab_status,
-        }
+        handler, flag = self.handlers.get(cmd_type, (None, None))
+        # Integrations are only available while enabled in the panel
+        if handler and flag and not getattr(bpy.context.scene, flag):
+            handler = None
 
-        # Add Polyhaven handlers only if enabled
-        if bpy.context.scene.blendermcp_use_polyhaven:
-            polyhaven_handlers = {
-                "get_polyhaven_categories": self.get_polyhaven_categories,
-                "search_polyhaven_assets": self.search_polyhaven_assets,
-                "download_polyhaven_asset": self.download_polyhaven_asset,
-                "set_texture": self.set_texture,
-            }
-            handlers.update(polyhaven_handlers)
-
-        # Add Hyper3d handlers only if enabled
-        if bpy.context.scene.blendermcp_use_hyper3d:
-            polyhaven_handlers = {
-                "create_rodin_job": self.create_rodin_job,
-                "poll_rodin_job_status": self.poll_rodin_job_status,
-                "import_generated_asset": self.import_generated_asset,
-            }
-            handlers.update(polyhaven_handlers)
-
-        # Add Sketchfab handlers only if enabled
-        if bpy.context.scene.blendermcp_use_sketchfab:
-            sketchfab_handlers = {
-                "search_sketchfab_models": self.search_sketchfab_models,
-                "download_sketchfab_model": self.download_sketchfab_model,
-            }
-            handlers.update(sketchfab_handlers)
-
-        handler = handlers.get(cmd_type)
         if handler:
             try:
                 print(f"Executing handler for {cmd_type}")
@@ -250,6 +1349,57 @@ class BlenderMCPServer:
         else:
             return {"status": "error", "message": f"Unknown command type: {cmd_type}"}
 
+    def changes_since(self, version):
+        """Objects changed after the given scene version
+
+        resync is true when the version is too old (or from before a file
+        load); the client then has to read the scene again with query_scene.
+        """
+        return self.scene_tracker.since(int(version))
+
+    def get_queue_stats(self):
+        """Queue length and per-command wait and execution times"""
+        return self.command_queue.summary()
+
+    def execute_batch(self, commands, stop_on_error=False):
+        """Execute an ordered list of commands and return one result per command
+
+        Each item is dispatched like a standalone command. With stop_on_error
+        the remaining items are skipped after the first failure.
+        """
+        if not isinstance(commands, list):
+            raise ValueError("commands must be a list of command objects")
+
+        results = []
+        failed = 0
+        for index, sub in enumerate(commands):
+            if failed and stop_on_error:
+                result = {"status": "skipped"}
+            elif not isinstance(sub, dict):
+                result = {"status": "error", "message": "Command must be a JSON object"}
+            elif sub.get("type") in ("batch", "handshake"):
+                result = {"status": "error", "message": f"{sub.get('type')} is not allowed inside a batch"}
+            else:
+                try:
+                    result = self._execute_command_internal(sub)
+                except Exception as e:
+                    traceback.print_exc()
+                    result = {"status": "error", "message": str(e)}
+
+            if result["status"] == "error":
+                failed += 1
+            if isinstance(sub, dict) and "id" in sub:
+                result["id"] = sub["id"]
+            result["index"] = index
+            results.append(result)
+
+        return {
+            "results": results,
+            "succeeded": sum(1 for r in results if r["status"] == "success"),
+            "failed": failed,
+            "skipped": sum(1 for r in results if r["status"] == "skipped"),
+        }
+
 
 
     def get_scene_info(self):
@@ -308,34 +1458,29 @@ class BlenderMCPServer:
 
 
 
-    def get_object_info(self, name):
-        """Get detailed information about a specific object"""
-        obj = bpy.data.objects.get(name)
-        if not obj:
-            raise ValueError(f"Object not found: {name}")
-
-        # Basic object info
+    def _describe_object(self, obj, fields):
+        """Name and type plus the requested OBJECT_FIELDS; nothing else is computed"""
         obj_info = {
             "name": obj.name,
             "type": obj.type,
-            "location": [obj.location.x, obj.location.y, obj.location.z],
-            "rotation": [obj.rotation_euler.x, obj.rotation_euler.y, obj.rotation_euler.z],
-            "scale": [obj.scale.x, obj.scale.y, obj.scale.z],
-            "visible": obj.visible_get(),
-            "materials": [],
         }
 
-        if obj.type == "MESH":
-            bounding_box = self._get_aabb(obj)
-            obj_info["world_bounding_box"] = bounding_box
+        if "transform" in fields:
+            obj_info["location"] = [obj.location.x, obj.location.y, obj.location.z]
+            obj_info["rotation"] = [obj.rotation_euler.x, obj.rotation_euler.y, obj.rotation_euler.z]
+            obj_info["scale"] = [obj.scale.x, obj.scale.y, obj.scale.z]
+
+        if "visibility" in fields:
+            obj_info["visible"] = obj.visible_get()
 
-        # Add material slots
-        for slot in obj.material_slots:
-            if slot.material:
-                obj_info["materials"].append(slot.material.name)
+        if "materials" in fields:
+            obj_info["materials"] = [slot.material.name for slot in obj.material_slots if slot.material]
+
+        if "bounds" in fields and obj.type == "MESH":
+            obj_info["world_bounding_box"] = self._get_aabb(obj)
 
         # Add mesh data if applicable
-        if obj.type == 'MESH' and obj.data:
+        if "mesh" in fields and obj.type == 'MESH' and obj.data:
             mesh = obj.data
             obj_info["mesh"] = {
                 "vertices": len(mesh.vertices),
@@ -345,6 +1490,58 @@ class BlenderMCPServer:
 
         return obj_info
 
+    def get_object_info(self, name):
+        """Get detailed information about a specific object"""
+        obj = bpy.data.objects.get(name)
+        if not obj:
+            raise ValueError(f"Object not found: {name}")
+
+        return self._describe_object(obj, OBJECT_FIELDS)
+
+    def query_scene(self, types=None, collection=None, name_pattern=None, fields=None, cursor=None, limit=QUERY_PAGE_SIZE):
+        """Filtered, paginated listing of the objects in the current scene
+
+        Objects are ordered by name; pass the returned next_cursor to get the
+        following page. Filters are cheap attribute checks, the per-object
+        fields are only computed for the objects on the returned page.
+        """
+        if isinstance(types, str):
+            types = [types]
+        if types:
+            types = {t.upper() for t in types}
+
+        fields = set(fields or [])
+        unknown = fields - set(OBJECT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {sorted(unknown)}, choose from {list(OBJECT_FIELDS)}")
+
+        limit = max(1, min(int(limit), QUERY_MAX_PAGE_SIZE))
+
+        objects = bpy.context.scene.objects
+        if collection:
+            coll = bpy.data.collections.get(collection)
+            if not coll:
+                raise ValueError(f"Collection not found: {collection}")
+            in_collection = {o.name for o in coll.all_objects}
+            objects = [o for o in objects if o.name in in_collection]
+
+        matches = [
+            obj for obj in objects
+            if (not types or obj.type in types)
+            and (not name_pattern or fnmatch.fnmatchcase(obj.name, name_pattern))
+        ]
+        matches.sort(key=lambda o: o.name)
+
+        # The cursor is the name of the last object of the previous page
+        remaining = [o for o in matches if o.name > cursor] if cursor else matches
+        page = remaining[:limit]
+
+        return {
+            "total": len(matches),
+            "objects": [self._describe_object(obj, fields) for obj in page],
+            "next_cursor": page[-1].name if len(remaining) > limit else None,
+        }
+
     def get_viewport_screenshot(self, max_size=800, filepath=None, format="png"):
         """
         Capture a screenshot of the current 3D viewport and save it to the specified path.
@@ -422,58 +1619,107 @@ class BlenderMCPServer:
 
 
     def get_polyhaven_categories(self, asset_type):
-        """Get categories for a specific asset type from Polyhaven"""
+        """Get categories for a specific asset type from the local Polyhaven catalog"""
         try:
             if asset_type not in ["hdris", "textures", "models", "all"]:
                 return {"error": f"Invalid asset type: {asset_type}. Must be one of: hdris, textures, models, all"}
 
-            response = requests.get(f"https://api.polyhaven.com/categories/{asset_type}", headers=REQ_HEADERS)
-            if response.status_code == 200:
-                return {"categories": response.json()}
-            else:
-                return {"error": f"API request failed with status code {response.status_code}"}
+            return {"categories": self.polyhaven_catalog.categories(asset_type)}
         except Exception as e:
             return {"error": str(e)}
 
-    def search_polyhaven_assets(self, asset_type=None, categories=None):
-        """Search for assets from Polyhaven with optional filtering"""
-        try:
-            url = "https://api.polyhaven.com/assets"
-            params = {}
+    def search_polyhaven_assets(self, asset_type=None, categories=None, query=None, cursor=None, limit=20):
+        """Search the local Polyhaven catalog with optional filtering
 
+        Results are ranked by how well they match the query words, then by
+        download count; pass next_cursor back as cursor for the next page.
+        """
+        try:
             if asset_type and asset_type != "all":
                 if asset_type not in ["hdris", "textures", "models"]:
                     return {"error": f"Invalid asset type: {asset_type}. Must be one of: hdris, textures, models, all"}
-                params["type"] = asset_type
 
-            if categories:
-                params["categories"] = categories
-
-            response = requests.get(url, params=params, headers=REQ_HEADERS)
-            if response.status_code == 200:
-                # Limit the response size to avoid overwhelming Blender
-                assets = response.json()
-                # Return only the first 20 assets to keep response size manageable
-                limited_assets = {}
-                for i, (key, value) in enumerate(assets.items()):
-                    if i >= 20:  # Limit to 20 assets
-                        break
-                    limited_assets[key] = value
+            # Limit the response size to avoid overwhelming Blender
+            limit = max(1, min(int(limit), 100))
+            page, total, next_cursor = self.polyhaven_catalog.search(asset_type, categories, query, cursor, limit)
+            assets = {asset_id: self.polyhaven_catalog.assets[asset_id] for asset_id in page}
 
-                return {"assets": limited_assets, "total_count": len(assets), "returned_count": len(limited_assets)}
-            else:
-                return {"error": f"API request failed with status code {response.status_code}"}
+            return {"assets": assets, "total_count": total, "returned_count": len(assets), "next_cursor": next_cursor}
         except Exception as e:
             return {"error": str(e)}
 
+    def _prefetch_polyhaven_catalog(self, **params):
+        """Load or refresh the catalog off the main thread"""
+        self.polyhaven_catalog.ensure_fresh()
+
+    def _polyhaven_files(self, asset_id):
+        """File listing of an asset, cached like the files themselves"""
+        def fetch_files():
+            files_response = HTTP_SESSION.get(f"{POLYHAVEN_API}/files/{asset_id}", headers=REQ_HEADERS, timeout=30)
+            if files_response.status_code != 200:
+                raise ValueError(f"Failed to get asset files: {files_response.status_code}")
+            return files_response.json()
+
+        return self.asset_cache.manifest(asset_id, fetch_files)
+
+    @staticmethod
+    def _polyhaven_default_format(asset_type):
+        return {"hdris": "hdr", "textures": "jpg", "models": "gltf"}.get(asset_type)
+
+    @staticmethod
+    def _select_polyhaven_files(files_data, asset_type, resolution, file_format):
+        """Name -> Polyhaven file entry of everything an import needs
+
+        Names are "hdri" for HDRIs, the map type for textures, and for models
+        "" for the main file plus the relative path of each included file.
+        """
+        if asset_type == "hdris":
+            if "hdri" in files_data and resolution in files_data["hdri"] and file_format in files_data["hdri"][resolution]:
+                return {"hdri": files_data["hdri"][resolution][file_format]}
+        elif asset_type == "textures":
+            return {
+                map_type: files_data[map_type][resolution][file_format]
+                for map_type in files_data
+                if map_type not in ["blend", "gltf"]  # Skip non-texture files
+                and resolution in files_data[map_type] and file_format in files_data[map_type][resolution]
+            }
+        elif asset_type == "models":
+            if file_format in files_data and resolution in files_data[file_format]:
+                file_info = files_data[file_format][resolution][file_format]
+                return {"": file_info, **(file_info.get("include") or {})}
+        return {}
+
+    def _fetch_files(self, files, asset_id, resolution, file_format):
+        """Download files into the asset cache concurrently
+
+        Returns name -> (path, from_cache) or the exception raised for that file.
+        """
+        def fetch(file_info):
+            try:
+                return self.asset_cache.fetch(file_info, asset_id, resolution, file_format)
+            except Exception as e:
+                return e
+
+        if self.download_pool and len(files) > 1:
+            try:
+                return dict(zip(files, self.download_pool.map(fetch, files.values())))
+            except RuntimeError:
+                pass  # Pool is shutting down
+        return {name: fetch(file_info) for name, file_info in files.items()}
+
+    def _prefetch_polyhaven_asset(self, asset_id, asset_type, resolution="1k", file_format=None):
+        """Fill the cache for download_polyhaven_asset without touching bpy"""
+        file_format = file_format or self._polyhaven_default_format(asset_type)
+        files = self._select_polyhaven_files(self._polyhaven_files(asset_id), asset_type, resolution, file_format)
+        self._fetch_files(files, asset_id, resolution, file_format)
+
     def download_polyhaven_asset(self, asset_id, asset_type, resolution="1k", file_format=None):
         try:
             # First get the files information
-            files_response = requests.get(f"https://api.polyhaven.com/files/{asset_id}", headers=REQ_HEADERS)
-            if files_response.status_code != 200:
-                return {"error": f"Failed to get asset files: {files_response.status_code}"}
-
-            files_data = files_response.json()
+            try:
+                files_data = self._polyhaven_files(asset_id)
+            except ValueError as e:
+                return {"error": str(e)}
 
             # Handle different asset types
             if asset_type == "hdris":
@@ -481,20 +1727,18 @@ class BlenderMCPServer:
                 if not file_format:
                     file_format = "hdr"  # Default format for HDRIs
 
-                if "hdri" in files_data and resolution in files_data["hdri"] and file_format in files_data["hdri"][resolution]:
-                    file_info = files_data["hdri"][resolution][file_format]
-                    file_url = file_info["url"]
+                files = self._select_polyhaven_files(files_data, asset_type, resolution, file_format)
+                if files:
+                    # The image is not packed, so Blender keeps referencing this file;
+                    # use a copy (hard link) so cache eviction can not break the world
+                    fetched = self._fetch_files(files, asset_id, resolution, file_format)["hdri"]
+                    if isinstance(fetched, Exception):
+                        return {"error": f"Failed to download HDRI: {str(fetched)}"}
+                    cache_path, cached = fetched
 
-                    # For HDRIs, we need to save to a temporary file first
-                    # since Blender can't properly load HDR data directly from memory
                     with tempfile.NamedTemporaryFile(suffix=f".{file_format}", delete=False) as tmp_file:
-                        # Download the file
-                        response = requests.get(file_url, headers=REQ_HEADERS)
-                        if response.status_code != 200:
-                            return {"error": f"Failed to download HDRI: {response.status_code}"}
-
-                        tmp_file.write(response.content)
                         tmp_path = tmp_file.name
+                    self.asset_cache.materialize(cache_path, tmp_path)
 
                     try:
                         # Create a new world if none exists
@@ -562,7 +1806,8 @@ class BlenderMCPServer:
                         return {
                             "success": True,
                             "message": f"HDRI {asset_id} imported successfully",
-                            "image_name": env_tex.image.name
+                            "image_name": env_tex.image.name,
+                            "cached": cached
                         }
                     except Exception as e:
                         return {"error": f"Failed to set up HDRI in Blender: {str(e)}"}
@@ -574,48 +1819,38 @@ class BlenderMCPServer:
                     file_format = "jpg"  # Default format for textures
 
                 downloaded_maps = {}
+                all_cached = True
 
                 try:
-                    for map_type in files_data:
-                        if map_type not in ["blend", "gltf"]:  # Skip non-texture files
-                            if resolution in files_data[map_type] and file_format in files_data[map_type][resolution]:
-                                file_info = files_data[map_type][resolution][file_format]
-                                file_url = file_info["url"]
-
-                                # Use NamedTemporaryFile like we do for HDRIs
-                                with tempfile.NamedTemporaryFile(suffix=f".{file_format}", delete=False) as tmp_file:
-                                    # Download the file
-                                    response = requests.get(file_url, headers=REQ_HEADERS)
-                                    if response.status_code == 200:
-                                        tmp_file.write(response.content)
-                                        tmp_path = tmp_file.name
-
-                                        # Load image from temporary file
-                                        image = bpy.data.images.load(tmp_path)
-                                        image.name = f"{asset_id}_{map_type}.{file_format}"
-
-                                        # Pack the image into .blend file
-                                        image.pack()
-
-                                        # Set color space based on map type
-                                        if map_type in ['color', 'diffuse', 'albedo']:
-                                            try:
-                                                image.colorspace_settings.name = 'sRGB'
-                                            except:
-                                                pass
-                                        else:
-                                            try:
-                                                image.colorspace_settings.name = 'Non-Color'
-                                            except:
-                                                pass
-
-                                        downloaded_maps[map_type] = image
-
-                                        # Clean up temporary file
-                                        try:
-                                            os.unlink(tmp_path)
-                                        except:
-                                            pass
+                    # All maps download concurrently; only creating the images is serial
+                    files = self._select_polyhaven_files(files_data, asset_type, resolution, file_format)
+                    for map_type, fetched in self._fetch_files(files, asset_id, resolution, file_format).items():
+                        if isinstance(fetched, Exception):
+                            print(f"Failed to download {map_type} map: {str(fetched)}")
+                            continue
+                        tmp_path, cached = fetched
+                        all_cached = all_cached and cached
+
+                        # Load image from the cache; packing makes the material independent of the file
+                        image = bpy.data.images.load(tmp_path)
+                        image.name = f"{asset_id}_{map_type}.{file_format}"
+
+                        # Pack the image into .blend file
+                        image.pack()
+
+                        # Set color space based on map type
+                        if map_type in ['color', 'diffuse', 'albedo']:
+                            try:
+                                image.colorspace_settings.name = 'sRGB'
+                            except:
+                                pass
+                        else:
+                            try:
+                                image.colorspace_settings.name = 'Non-Color'
+                            except:
+                                pass
+
+                        downloaded_maps[map_type] = image
 
                     if not downloaded_maps:
                         return {"error": f"No texture maps found for the requested resolution and format"}
@@ -698,7 +1933,8 @@ class BlenderMCPServer:
                         "success": True,
                         "message": f"Texture {asset_id} imported as material",
                         "material": mat.name,
-                        "maps": list(downloaded_maps.keys())
+                        "maps": list(downloaded_maps.keys()),
+                        "cached": all_cached
                     }
 
                 except Exception as e:
@@ -709,9 +1945,9 @@ class BlenderMCPServer:
                 if not file_format:
                     file_format = "gltf"  # Default format for models
 
-                if file_format in files_data and resolution in files_data[file_format]:
-                    file_info = files_data[file_format][resolution][file_format]
-                    file_url = file_info["url"]
+                files = self._select_polyhaven_files(files_data, asset_type, resolution, file_format)
+                if files:
+                    file_url = files[""]["url"]
 
                     # Create a temporary directory to store the model and its dependencies
                     temp_dir = tempfile.mkdtemp()
@@ -722,30 +1958,21 @@ class BlenderMCPServer:
                         main_file_name = file_url.split("/")[-1]
                         main_file_path = os.path.join(temp_dir, main_file_name)
 
-                        response = requests.get(file_url, headers=REQ_HEADERS)
-                        if response.status_code != 200:
-                            return {"error": f"Failed to download model: {response.status_code}"}
-
-                        with open(main_file_path, "wb") as f:
-                            f.write(response.content)
-
-                        # Check for included files and download them
-                        if "include" in file_info and file_info["include"]:
-                            for include_path, include_info in file_info["include"].items():
-                                # Get the URL for the included file - this is the fix
-                                include_url = include_info["url"]
-
-                                # Create the directory structure for the included file
-                                include_file_path = os.path.join(temp_dir, include_path)
-                                os.makedirs(os.path.dirname(include_file_path), exist_ok=True)
-
-                                # Download the included file
-                                include_response = requests.get(include_url, headers=REQ_HEADERS)
-                                if include_response.status_code == 200:
-                                    with open(include_file_path, "wb") as f:
-                                        f.write(include_response.content)
-                                else:
-                                    print(f"Failed to download included file: {include_path}")
+                        # The model file and all included files download concurrently
+                        fetched = self._fetch_files(files, asset_id, resolution, file_format)
+                        if isinstance(fetched[""], Exception):
+                            return {"error": f"Failed to download model: {str(fetched[''])}"}
+                        cache_path, all_cached = fetched.pop("")
+                        self.asset_cache.materialize(cache_path, main_file_path)
+
+                        for include_path, result in fetched.items():
+                            if isinstance(result, Exception):
+                                print(f"Failed to download included file: {include_path}: {str(result)}")
+                                continue
+                            # Recreate the directory structure the model file refers to
+                            cache_path, cached = result
+                            all_cached = all_cached and cached
+                            self.asset_cache.materialize(cache_path, os.path.join(temp_dir, include_path))
 
                         # Import the model into Blender
                         if file_format == "gltf" or file_format == "glb":
@@ -772,7 +1999,8 @@ class BlenderMCPServer:
                         return {
                             "success": True,
                             "message": f"Model {asset_id} imported successfully",
-                            "imported_objects": imported_objects
+                            "imported_objects": imported_objects,
+                            "cached": all_cached
                         }
                     except Exception as e:
                         return {"error": f"Failed to import model: {str(e)}"}
@@ -1107,6 +2335,10 @@ class BlenderMCPServer:
                             3. Restart the connection to Claude"""
         }
 
+    def get_asset_cache_stats(self, verify=False):
+        """Size and hit/miss/eviction counters of the local asset cache"""
+        return self.asset_cache.stats(verify=verify)
+
     #region Hyper3D
     def get_hyper3d_status(self):
         """Get the current status of Hyper3D Rodin integration"""
@@ -1165,7 +2397,7 @@ class BlenderMCPServer:
                 files.append(("prompt", (None, text_prompt)))
             if bbox_condition:
                 files.append(("bbox_condition", (None, json.dumps(bbox_condition))))
-            response = requests.post(
+            response = HTTP_SESSION.post(
                 "https://hyperhuman.deemos.com/api/v2/rodin",
                 headers={
                     "Authorization": f"Bearer {bpy.context.scene.blendermcp_hyper3d_api_key}",
@@ -1193,7 +2425,7 @@ class BlenderMCPServer:
                 req_data["prompt"] = text_prompt
             if bbox_condition:
                 req_data["bbox_condition"] = bbox_condition
-            response = requests.post(
+            response = HTTP_SESSION.post(
                 "https://queue.fal.run/fal-ai/hyper3d/rodin",
                 headers={
                     "Authorization": f"Key {bpy.context.scene.blendermcp_hyper3d_api_key}",
@@ -1217,7 +2449,7 @@ class BlenderMCPServer:
 
     def poll_rodin_job_status_main_site(self, subscription_key: str):
         """Call the job status API to get the job status"""
-        response = requests.post(
+        response = HTTP_SESSION.post(
             "https://hyperhuman.deemos.com/api/v2/status",
             headers={
                 "Authorization": f"Bearer {bpy.context.scene.blendermcp_hyper3d_api_key}",
@@ -1233,11 +2465,12 @@ class BlenderMCPServer:
 
     def poll_rodin_job_status_fal_ai(self, request_id: str):
         """Call the job status API to get the job status"""
-        response = requests.get(
+        response = HTTP_SESSION.get(
             f"https://queue.fal.run/fal-ai/hyper3d/requests/{request_id}/status",
             headers={
                 "Authorization": f"KEY {bpy.context.scene.blendermcp_hyper3d_api_key}",
             },
+            timeout=30,
         )
         data = response.json()
         return data
@@ -1320,7 +2553,7 @@ class BlenderMCPServer:
 
     def import_generated_asset_main_site(self, task_uuid: str, name: str):
         """Fetch the generated asset, import into blender"""
-        response = requests.post(
+        response = HTTP_SESSION.post(
             "https://hyperhuman.deemos.com/api/v2/download",
             headers={
                 "Authorization": f"Bearer {bpy.context.scene.blendermcp_hyper3d_api_key}",
@@ -1341,7 +2574,7 @@ class BlenderMCPServer:
 
                 try:
                     # Download the content
-                    response = requests.get(i["url"], stream=True)
+                    response = HTTP_SESSION.get(i["url"], stream=True, timeout=30)
                     response.raise_for_status()  # Raise an exception for HTTP errors
 
                     # Write the content to the temporary file
@@ -1386,11 +2619,12 @@ class BlenderMCPServer:
 
     def import_generated_asset_fal_ai(self, request_id: str, name: str):
         """Fetch the generated asset, import into blender"""
-        response = requests.get(
+        response = HTTP_SESSION.get(
             f"https://queue.fal.run/fal-ai/hyper3d/requests/{request_id}",
             headers={
                 "Authorization": f"Key {bpy.context.scene.blendermcp_hyper3d_api_key}",
-            }
+            },
+            timeout=30,
         )
         data_ = response.json()
         temp_file = None
@@ -1403,7 +2637,7 @@ class BlenderMCPServer:
 
         try:
             # Download the content
-            response = requests.get(data_["model_mesh"]["url"], stream=True)
+            response = HTTP_SESSION.get(data_["model_mesh"]["url"], stream=True, timeout=30)
             response.raise_for_status()  # Raise an exception for HTTP errors
 
             # Write the content to the temporary file
@@ -1456,7 +2690,7 @@ class BlenderMCPServer:
                     "Authorization": f"Token {api_key}"
                 }
 
-                response = requests.get(
+                response = HTTP_SESSION.get(
                     "https://api.sketchfab.com/v3/me",
                     headers=headers,
                     timeout=30  # Add timeout of 30 seconds
@@ -1533,7 +2767,7 @@ class BlenderMCPServer:
 
 
             # Use the search endpoint as specified in the API documentation
-            response = requests.get(
+            response = HTTP_SESSION.get(
                 "https://api.sketchfab.com/v3/search",
                 headers=headers,
                 params=params,
@@ -1568,6 +2802,37 @@ class BlenderMCPServer:
             traceback.print_exc()
             return {"error": str(e)}
 
+    @staticmethod
+    def _extract_gltf(zip_ref, main_name, target_dir):
+        """Extract a glTF file and the buffers and images it references
+
+        A .glb is self-contained. If a referenced file is missing from the
+        archive, everything is extracted so the importer can still look for it.
+        """
+        zip_ref.extract(main_name, target_dir)
+        if not main_name.endswith(".gltf"):
+            return
+
+        with open(os.path.join(target_dir, main_name), encoding="utf-8") as f:
+            gltf = json.load(f)
+
+        members = set(zip_ref.namelist())
+        base_dir = os.path.dirname(main_name)
+        needed = set()
+        for item in gltf.get("buffers", []) + gltf.get("images", []):
+            uri = item.get("uri")
+            if not uri or uri.startswith("data:"):
+                continue
+            name = os.path.normpath(os.path.join(base_dir, urllib.parse.unquote(uri))).replace(os.sep, "/")
+            if name not in members:
+                print(f"Referenced file {name} not found in archive, extracting everything")
+                zip_ref.extractall(target_dir)
+                return
+            needed.add(name)
+
+        for name in needed:
+            zip_ref.extract(name, target_dir)
+
     def download_sketchfab_model(self, uid):
         """Download a model from Sketchfab by its UID"""
         try:
@@ -1583,7 +2848,7 @@ class BlenderMCPServer:
             # Request download URL using the exact endpoint from the documentation
             download_endpoint = f"https://api.sketchfab.com/v3/models/{uid}/download"
 
-            response = requests.get(
+            response = HTTP_SESSION.get(
                 download_endpoint,
                 headers=headers,
                 timeout=30  # Add timeout of 30 seconds
@@ -1610,18 +2875,16 @@ class BlenderMCPServer:
             if not download_url:
                 return {"error": "No download URL available for this model. Make sure the model is downloadable and you have access."}
 
-            # Download the model (already has timeout)
-            model_response = requests.get(download_url, timeout=60)  # 60 second timeout
-
-            if model_response.status_code != 200:
-                return {"error": f"Model download failed with status code {model_response.status_code}"}
-
-            # Save to temporary file
+            # Stream the archive to a temporary file
             temp_dir = tempfile.mkdtemp()
             zip_file_path = os.path.join(temp_dir, f"{uid}.zip")
 
-            with open(zip_file_path, "wb") as f:
-                f.write(model_response.content)
+            try:
+                stream_download(download_url, zip_file_path, timeout=60, label=f"Sketchfab model {uid}")
+            except DownloadError as e:
+                with suppress(Exception):
+                    shutil.rmtree(temp_dir)
+                return {"error": f"Model download failed with status code {e.status_code}"}
 
             # Extract the zip file with enhanced security
             with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
@@ -1650,16 +2913,23 @@ class BlenderMCPServer:
                             shutil.rmtree(temp_dir)
                         return {"error": "Security issue: Zip contains files with directory traversal sequence"}
 
-                # If all files passed security checks, extract them
-                zip_ref.extractall(temp_dir)
+                # Find the main glTF file at the top level of the archive
+                gltf_files = [
+                    name for name in zip_ref.namelist()
+                    if "/" not in name.strip("/") and (name.endswith('.gltf') or name.endswith('.glb'))
+                ]
 
-            # Find the main glTF file
-            gltf_files = [f for f in os.listdir(temp_dir) if f.endswith('.gltf') or f.endswith('.glb')]
+                if not gltf_files:
+                    with suppress(Exception):
+                        shutil.rmtree(temp_dir)
+                    return {"error": "No glTF file found in the downloaded model"}
 
-            if not gltf_files:
-                with suppress(Exception):
-                    shutil.rmtree(temp_dir)
-                return {"error": "No glTF file found in the downloaded model"}
+                # If all files passed security checks, extract only what the model needs
+                self._extract_gltf(zip_ref, gltf_files[0], temp_dir)
+
+            # The archive is no longer needed
+            with suppress(Exception):
+                os.remove(zip_file_path)
 
             main_file = os.path.join(temp_dir, gltf_files[0])
 
@@ -1702,6 +2972,7 @@ class BLENDERMCP_PT_Panel(bpy.types.Panel):
         scene = context.scene
 
         layout.prop(scene, "blendermcp_port")
+        layout.prop(scene, "blendermcp_tick_budget")
         layout.prop(scene, "blendermcp_use_polyhaven", text="Use assets from Poly Haven")
 
         layout.prop(scene, "blendermcp_use_hyper3d", text="Use Hyper3D Rodin 3D model generation")
@@ -1742,7 +3013,10 @@ class BLENDERMCP_OT_StartServer(bpy.types.Operator):
 
         # Create a new server instance
         if not hasattr(bpy.types, "blendermcp_server") or not bpy.types.blendermcp_server:
-            bpy.types.blendermcp_server = BlenderMCPServer(port=scene.blendermcp_port)
+            bpy.types.blendermcp_server = BlenderMCPServer(
+                port=scene.blendermcp_port,
+                tick_budget=scene.blendermcp_tick_budget / 1000
+            )
 
         # Start the server
         bpy.types.blendermcp_server.start()
@@ -1778,6 +3052,14 @@ def register():
         max=65535
     )
 
+    bpy.types.Scene.blendermcp_tick_budget = IntProperty(
+        name="Time Budget (ms)",
+        description="Main-thread time per UI tick for executing MCP commands",
+        default=20,
+        min=1,
+        max=1000
+    )
+
     bpy.types.Scene.blendermcp_server_running = bpy.props.BoolProperty(
         name="Server Running",
         default=False
@@ -1844,6 +3126,7 @@ def unregister():
     bpy.utils.unregister_class(BLENDERMCP_OT_StopServer)
 
     del bpy.types.Scene.blendermcp_port
+    del bpy.types.Scene.blendermcp_tick_budget
     del bpy.types.Scene.blendermcp_server_running
     del bpy.types.Scene.blendermcp_use_polyhaven
     del bpy.types.Scene.blendermcp_use_hyper3d
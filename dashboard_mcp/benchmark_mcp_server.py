@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Lastgenerator für den zentralen Workshop MCP Server
+Simuliert N gleichzeitige MCP-Clients (fastmcp Client) gegen einen lokalen
+Server mit Stub-Dashboard und misst Durchsatz, Latenz-Perzentile und Fehler
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+
+from fastmcp import Client
+from fastmcp.client.transports import SSETransport, StreamableHttpTransport
+
+from workshop_tracing import percentile
+
+SERVER_SCRIPT = Path(__file__).parent / "mcp_server_for_dashboard.py"
+
+DEFAULT_MIX = "workshop_add_todo=2,get_todos=3,tug_left=3,get_workshop_status=2"
+
+# Argumente je Tool für den Lastmix
+TOOL_ARGS = {
+    "workshop_add_todo": lambda i: {"task": f"Bench-Todo {i}"},
+    "workshop_set_mood": lambda i: {"mood": random.choice(["😊", "😐", "😴", "🤯"])},
+    "get_todos": lambda i: {"show_global": True},
+}
+
+# =============================================================================
+# STUB-DASHBOARD
+# =============================================================================
+
+class StubDashboardHandler(BaseHTTPRequestHandler):
+    """Beantwortet alle Dashboard-API-Aufrufe sofort mit 200"""
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.server.received += 1
+        self._reply({"status": "success"})
+
+    def do_GET(self):
+        self._reply({"status": "success"})
+
+    def _reply(self, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keine Zugriffs-Logs während der Messung
+
+def start_stub_dashboard() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubDashboardHandler)
+    server.received = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# =============================================================================
+# LOKALER MCP SERVER
+# =============================================================================
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_for_port(port: int, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.1)
+    raise TimeoutError(f"MCP Server auf Port {port} nicht erreichbar")
+
+def start_local_server(port: int, dashboard_url: str, transport: str, workdir: str) -> subprocess.Popen:
+    env = dict(os.environ,
+               MCP_HOST="127.0.0.1",
+               MCP_PORT=str(port),
+               DASHBOARD_URL=dashboard_url,
+               MCP_STATELESS="1" if transport == "http" else "0")
+    process = subprocess.Popen([sys.executable, str(SERVER_SCRIPT)], cwd=workdir, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wait_for_port(port)
+    return process
+
+# =============================================================================
+# LASTGENERATOR
+# =============================================================================
+
+def parse_mix(mix: str) -> Dict[str, int]:
+    """'tool_a=2,tool_b=1' -> {'tool_a': 2, 'tool_b': 1}"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = int(weight or 1)
+    return weights
+
+def make_transport(url: str, transport: str, client_no: int):
+    headers = {"User-Agent": f"mcp-bench-client-{client_no}"}
+    if transport == "http":
+        return StreamableHttpTransport(url, headers=headers)
+    return SSETransport(url, headers=headers)
+
+async def run_client(client_no: int, url: str, transport: str, mix: Dict[str, int],
+                     calls: int, results: Dict[str, List[tuple]]):
+    tools, weights = list(mix), list(mix.values())
+    async with Client(make_transport(url, transport, client_no)) as client:
+        for i in range(calls):
+            tool = random.choices(tools, weights)[0]
+            args = TOOL_ARGS.get(tool, lambda i: {})(i)
+            start = time.perf_counter()
+            ok = True
+            try:
+                await client.call_tool(tool, args)
+            except Exception:
+                ok = False
+            results.setdefault(tool, []).append((time.perf_counter() - start, ok))
+
+def summarize(results: Dict[str, List[tuple]], wall_time: float) -> dict:
+    per_tool = {}
+    total = errors = 0
+    for tool, samples in sorted(results.items()):
+        durations = [d for d, _ in samples]
+        failed = sum(1 for _, ok in samples if not ok)
+        total += len(samples)
+        errors += failed
+        per_tool[tool] = {
+            "calls": len(samples),
+            "errors": failed,
+            "error_rate": failed / len(samples),
+            "p50_ms": percentile(durations, 50) * 1000,
+            "p90_ms": percentile(durations, 90) * 1000,
+            "p99_ms": percentile(durations, 99) * 1000,
+            "max_ms": max(durations) * 1000,
+        }
+    return {
+        "total_calls": total,
+        "errors": errors,
+        "error_rate": errors / total if total else 0.0,
+        "wall_time_s": wall_time,
+        "throughput_per_s": total / wall_time if wall_time else 0.0,
+        "tools": per_tool,
+    }
+
+async def run_benchmark(args) -> dict:
+    mix = parse_mix(args.mix)
+    results: Dict[str, List[tuple]] = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_client(n, args.url, args.transport, mix, args.calls, results)
+        for n in range(args.clients)
+    ))
+    report = summarize(results, time.perf_counter() - start)
+    report["config"] = {
+        "clients": args.clients,
+        "calls_per_client": args.calls,
+        "mix": mix,
+        "transport": args.transport,
+        "url": args.url,
+    }
+    return report
+
+def print_report(report: dict):
+    print(f"📊 {report['total_calls']} Aufrufe in {report['wall_time_s']:.2f}s "
+          f"= {report['throughput_per_s']:.1f}/s, Fehler: {report['error_rate']:.1%}")
+    print(f"{'Tool':<24}{'Calls':>7}{'Err%':>7}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}")
+    for tool, stats in report["tools"].items():
+        print(f"{tool:<24}{stats['calls']:>7}{stats['error_rate']:>7.1%}"
+              f"{stats['p50_ms']:>8.1f}ms{stats['p90_ms']:>7.1f}ms{stats['p99_ms']:>7.1f}ms{stats['max_ms']:>7.1f}ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Lasttest für den zentralen Workshop MCP Server")
+    parser.add_argument("--clients", type=int, default=20, help="Anzahl gleichzeitiger MCP-Clients")
+    parser.add_argument("--calls", type=int, default=25, help="Tool-Aufrufe pro Client")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Gewichteter Tool-Mix, z.B. tug_left=3,get_todos=1")
+    parser.add_argument("--transport", choices=["sse", "http"], default="sse")
+    parser.add_argument("--url", help="Bestehenden Server verwenden statt einen lokalen zu starten")
+    parser.add_argument("--json", dest="json_out", help="Ergebnis als JSON in diese Datei schreiben")
+    args = parser.parse_args()
+
+    stub = process = None
+    workdir = tempfile.TemporaryDirectory()
+    try:
+        if not args.url:
+            stub = start_stub_dashboard()
+            port = free_port()
+            dashboard_url = f"http://127.0.0.1:{stub.server_address[1]}"
+            process = start_local_server(port, dashboard_url, args.transport, workdir.name)
+            args.url = f"http://127.0.0.1:{port}/" + ("mcp" if args.transport == "http" else "sse")
+            print(f"🚀 Lokaler Server: {args.url} (Stub-Dashboard: {dashboard_url})")
+
+        report = asyncio.run(run_benchmark(args))
+        if stub:
+            report["dashboard_posts"] = stub.received
+        print_report(report)
+
+        if args.json_out:
+            Path(args.json_out).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+            print(f"💾 Ergebnis gespeichert: {args.json_out}")
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+        if stub:
+            stub.shutdown()
+        workdir.cleanup()
+
+if __name__ == "__main__":
+    main()
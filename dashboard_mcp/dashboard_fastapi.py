@@ -5,19 +5,40 @@ Sammelt Updates von 20 Workshop-PCs und zeigt sie live auf dem Beamer
 Mit JSON-Persistierung für Datenspeicherung bei Neustart
 """
 
+import time
+STARTUP_T0 = time.perf_counter()  # Startzeit-Messung, vor allen schweren Imports
+
 import asyncio
+import contextvars
 import json
+import os
 import socket
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Set
 
-import uvicorn
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
+from workshop_tracing import TraceLog
+
+# =============================================================================
+# TRACING
+# =============================================================================
+
+# Trace-IDs kommen vom MCP Server (X-Trace-ID) und landen im WebSocket-Frame
+TRACE_ENABLED = os.getenv("WORKSHOP_TRACE", "0") == "1"
+TRACE_FILE = Path(os.getenv("DASHBOARD_TRACE_FILE", "dashboard_traces.jsonl"))
+MAX_OPEN_FRAMES = 1000  # Gesendete Frames, die noch auf ein Render-Ack warten
+
+current_trace: contextvars.ContextVar = contextvars.ContextVar("current_trace", default=None)
+
+trace_log = TraceLog(TRACE_FILE, "dashboard", TRACE_ENABLED, current_trace)
+
 # =============================================================================
 # DATENMODELLE
 # =============================================================================
@@ -27,16 +48,26 @@ class TodoUpdate(BaseModel):
     pc_id: str
     timestamp: str = None
 
+class TodoBatchUpdate(BaseModel):
+    tasks: List[str]
+    pc_id: str
+    timestamp: str = None
+    tool_name: str = None  # Tool-Usage wird mit dem Batch gezählt statt per eigenem POST
+
 class MoodUpdate(BaseModel):
     mood: str  # 😊😐😴🤯
     pc_id: str
     timestamp: str = None
+    count: int = 1  # Gebündelte Stimmungswechsel, die letzte gewinnt
+    tool_name: str = None  # Tool-Usage wird mit dem Event gezählt statt per eigenem POST
 
 # Datenmodell
 class TugUpdate(BaseModel):
     direction: str  # "left" or "right"
     pc_id: str
     timestamp: str = None
+    count: int = 1  # Gebündelte Pulls vom rate-limitierten MCP Server
+    tool_name: str = None  # Tool-Usage wird mit dem Event gezählt statt per eigenem POST
 
 class ToolUsageUpdate(BaseModel):
     tool_name: str
@@ -48,7 +79,7 @@ class ToolUsageUpdate(BaseModel):
 # =============================================================================
 
 class WorkshopDashboard:
-    def __init__(self, data_file: str = "workshop_data.json"):
+    def __init__(self, data_file: str = "workshop_data.json", load: bool = True):
         self.data_file = Path(data_file)
         self.todos: List[Dict] = []
         self.moods: Dict[str, str] = {}  # pc_id -> mood
@@ -58,12 +89,19 @@ class WorkshopDashboard:
         self.tug_left_pulls: int = 0
         self.tug_right_pulls: int = 0
         self.tug_position = 50
+        self.open_frames: OrderedDict = OrderedDict()  # frame_id -> (Sendezeit, Trace-IDs)
+        self.frame_seq = 0
         
-        # Daten beim Start laden
-        self.load_data()
+        # Daten beim Start laden (mit load=False erst im App-Lifespan)
+        if load:
+            self.load_data()
 
     def save_data(self):
         """Speichere aktuelle Daten in JSON-Datei"""
+        with trace_log.span("save_data"):
+            self._save_data()
+
+    def _save_data(self):
         try:
             data = {
                 "todos": self.todos,
@@ -119,9 +157,26 @@ class WorkshopDashboard:
         
         self.save_data()  # Nach Änderung speichern
 
+    def add_todos(self, update: TodoBatchUpdate):
+        """Mehrere Todos mit nur einem Speichervorgang übernehmen"""
+        timestamp = update.timestamp or datetime.now().isoformat()
+        self.todos.extend(
+            {"task": task, "pc_id": update.pc_id, "timestamp": timestamp}
+            for task in update.tasks
+        )
+        self.active_pcs.add(update.pc_id)
+        self.count_tool_usage(update.tool_name)
+        
+        # Nur letzte 50 Todos behalten
+        if len(self.todos) > 50:
+            self.todos = self.todos[-50:]
+        
+        self.save_data()
+
     def update_mood(self, update: MoodUpdate):
         self.moods[update.pc_id] = update.mood
         self.active_pcs.add(update.pc_id)
+        self.count_tool_usage(update.tool_name, update.count)
         self.save_data()
 
     def track_tool_usage(self, update: ToolUsageUpdate):
@@ -129,11 +184,16 @@ class WorkshopDashboard:
         self.active_pcs.add(update.pc_id)
         self.save_data()
 
+    def count_tool_usage(self, tool_name: str, count: int = 1):
+        """Tool-Usage zählen, die in einem anderen Event mitgeschickt wurde (speichert nicht selbst)"""
+        if tool_name:
+            self.tool_usage[tool_name] = self.tool_usage.get(tool_name, 0) + count
+
     def update_tug(self, update: TugUpdate):
         """Update Tauziehen-State (mit ausführlichen Debug-Prints)"""
         # --- Debug: Eingangszustand ------------------------------------------------
         print("\n[TUG][DEBUG] ---- update_tug() aufgerufen ----")
-        print(f"[TUG][DEBUG] Eingabe: direction={getattr(update, 'direction', None)!r}, pc_id={getattr(update, 'pc_id', None)!r}")
+        print(f"[TUG][DEBUG] Eingabe: direction={getattr(update, 'direction', None)!r}, pc_id={getattr(update, 'pc_id', None)!r}, count={update.count}")
 
         prev_left = getattr(self, "tug_left_pulls", 0)
         prev_right = getattr(self, "tug_right_pulls", 0)
@@ -144,14 +204,16 @@ class WorkshopDashboard:
 
         # --- Zähler aktualisieren ---------------------------------------------------
         if update.direction == "left":
-            self.tug_left_pulls += 1
+            self.tug_left_pulls += update.count
             print(f"[TUG][DEBUG] Pull nach LINKS registriert -> left: {prev_left} -> {self.tug_left_pulls}")
         elif update.direction == "right":
-            self.tug_right_pulls += 1
+            self.tug_right_pulls += update.count
             print(f"[TUG][DEBUG] Pull nach RECHTS registriert -> right: {prev_right} -> {self.tug_right_pulls}")
         else:
             print(f"[TUG][WARN ] Unbekannte direction {update.direction!r} – Zähler bleiben unverändert.")
 
+        self.count_tool_usage(update.tool_name, update.count)
+
         # --- active_pcs aktualisieren ----------------------------------------------
         was_active = update.pc_id in self.active_pcs
         self.active_pcs.add(update.pc_id)
@@ -214,16 +276,25 @@ class WorkshopDashboard:
         print("🔄 Neues Tauziehen-Spiel gestartet!")
         
         # Broadcast update to all clients
-        await self.broadcast_to_clients()
+        await self.broadcast_to_clients([])
     
-    async def broadcast_to_clients(self):
+    async def broadcast_to_clients(self, trace_ids: List[str] = None):
         """Helper method to broadcast updates"""
+        if trace_ids is None:
+            trace_ids = [current_trace.get()] if current_trace.get() else []
         if not self.connected_clients:
             return
         
-        data = json.dumps(self.get_dashboard_data())
+        frame = self.get_dashboard_data()
+        if TRACE_ENABLED and trace_ids:
+            self.frame_seq += 1
+            frame["frame_id"] = self.frame_seq
+            frame["trace_ids"] = trace_ids
+        data = json.dumps(frame)
         disconnected = set()
         
+        start = time.time()
+        begin = time.perf_counter()
         for client in self.connected_clients:
             try:
                 await client.send_text(data)
@@ -233,6 +304,25 @@ class WorkshopDashboard:
         # Getrennte Clients entfernen
         for client in disconnected:
             self.connected_clients.discard(client)
+        
+        if "frame_id" not in frame:
+            return
+        sent = time.perf_counter()
+        for trace_id in trace_ids:
+            trace_log.record(trace_id, "ws_broadcast", f"{len(self.connected_clients)} clients", start, sent - begin)
+        self.open_frames[frame["frame_id"]] = (sent, trace_ids)
+        while len(self.open_frames) > MAX_OPEN_FRAMES:
+            self.open_frames.popitem(last=False)
+
+    def frame_rendered(self, frame_id: int):
+        """Render-Ack eines Beamer-Browsers: Zeit vom Senden bis zum gezeichneten Frame"""
+        entry = self.open_frames.get(frame_id)
+        if entry is None:
+            return
+        sent, trace_ids = entry
+        elapsed = time.perf_counter() - sent
+        for trace_id in trace_ids:
+            trace_log.record(trace_id, "frame_rendered", f"frame {frame_id}", time.time() - elapsed, elapsed)
 
     def reset_data(self):
         """Setze alle Daten zurück (für Admin/Reset-Zwecke)"""
@@ -269,8 +359,21 @@ class WorkshopDashboard:
 # FASTAPI APP
 # =============================================================================
 
-app = FastAPI(title="Workshop Dashboard Server")
-dashboard = WorkshopDashboard()
+dashboard = WorkshopDashboard(load=False)
+
+# Startzustand für /readyz
+startup_state = {"ready": False, "ready_ms": None}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Daten erst beim Serverstart laden statt beim Import"""
+    dashboard.load_data()
+    startup_state["ready_ms"] = round((time.perf_counter() - STARTUP_T0) * 1000, 1)
+    startup_state["ready"] = True
+    print(f"⚡ Dashboard bereit nach {startup_state['ready_ms']:.0f} ms (seit Prozessstart)")
+    yield
+
+app = FastAPI(title="Workshop Dashboard Server", lifespan=lifespan)
 
 # Static files für HTML Dashboard
 dashboard_dir = Path(__file__).parent / "dashboard"
@@ -294,9 +397,15 @@ async def websocket_endpoint(websocket: WebSocket):
         # Aktuelle Daten sofort senden
         await websocket.send_text(json.dumps(dashboard.get_dashboard_data()))
         
-        # Connection alive halten
+        # Connection alive halten, Render-Acks der Beamer-Seite entgegennehmen
         while True:
-            await asyncio.sleep(1)
+            message = await websocket.receive_text()
+            try:
+                ack = json.loads(message).get("frame_ack")
+            except (ValueError, AttributeError):
+                continue
+            if ack is not None:
+                dashboard.frame_rendered(ack)
             
     except WebSocketDisconnect:
         dashboard.connected_clients.remove(websocket)
@@ -306,6 +415,84 @@ async def broadcast_update():
     """Sende Update an alle verbundenen Dashboard-Clients"""
     await dashboard.broadcast_to_clients()
 
+async def trace_requests(request: Request, call_next):
+    """X-Trace-ID vom MCP Server übernehmen und den Handler als Span messen"""
+    trace_id = request.headers.get("X-Trace-ID")
+    if trace_id is None:
+        return await call_next(request)
+    token = current_trace.set(trace_id)
+    try:
+        with trace_log.span("dashboard_handler", request.url.path):
+            return await call_next(request)
+    finally:
+        current_trace.reset(token)
+
+# Ohne Tracing kostet die Middleware nur Zeit pro Request
+if TRACE_ENABLED:
+    app.middleware("http")(trace_requests)
+
+# =============================================================================
+# IN-PROCESS EVENT-BUS (EINGEBETTETER MODUS)
+# =============================================================================
+
+class DashboardEventBus:
+    """Nimmt Events des im selben Prozess laufenden MCP Servers entgegen
+
+    Statt HTTP-POST + JSON + Pydantic-Validierung landen die Events direkt
+    im WorkshopDashboard. publish() ist thread-sicher (MCP-Tools und der
+    Rate-Limit-Thread rufen es auf) und reiht die Verarbeitung in den
+    Event-Loop ein; mehrere Events im selben Loop-Durchlauf teilen sich
+    einen WebSocket-Broadcast.
+    """
+
+    def __init__(self, dashboard: WorkshopDashboard):
+        self.dashboard = dashboard
+        self.loop: asyncio.AbstractEventLoop = None
+        self._broadcast_scheduled = False
+        self._trace_ids: List[str] = []  # Trace-IDs der Events seit dem letzten Broadcast
+        # Endpoint -> (Datenmodell, Handler), analog zu den /api/*-Routen
+        self.handlers = {
+            "todo": (TodoUpdate, dashboard.add_todo),
+            "todos": (TodoBatchUpdate, dashboard.add_todos),
+            "mood": (MoodUpdate, dashboard.update_mood),
+            "tool-usage": (ToolUsageUpdate, dashboard.track_tool_usage),
+            "tug": (TugUpdate, dashboard.update_tug),
+        }
+
+    def attach(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+
+    def publish(self, endpoint: str, data: dict, trace_id: str = None) -> bool:
+        if self.loop is None or endpoint not in self.handlers:
+            return False
+        self.loop.call_soon_threadsafe(self._dispatch, endpoint, data, trace_id)
+        return True
+
+    def _dispatch(self, endpoint: str, data: dict, trace_id: str = None):
+        model, handler = self.handlers[endpoint]
+        token = current_trace.set(trace_id)
+        try:
+            # Daten kommen aus dem eigenen Prozess -> ohne Validierung übernehmen
+            with trace_log.span("dashboard_handler", f"bus:{endpoint}"):
+                handler(model.model_construct(**data))
+        except Exception as e:
+            print(f"⚠️ Event {endpoint} fehlgeschlagen: {e}")
+            return
+        finally:
+            current_trace.reset(token)
+        if trace_id:
+            self._trace_ids.append(trace_id)
+        if not self._broadcast_scheduled:
+            self._broadcast_scheduled = True
+            self.loop.create_task(self._broadcast())
+
+    async def _broadcast(self):
+        self._broadcast_scheduled = False
+        trace_ids, self._trace_ids = self._trace_ids, []
+        await self.dashboard.broadcast_to_clients(trace_ids)
+
+event_bus = DashboardEventBus(dashboard)
+
 # =============================================================================
 # HTTP ENDPOINTS FÜR WORKSHOP-PC UPDATES
 # =============================================================================
@@ -317,6 +504,13 @@ async def receive_todo(update: TodoUpdate):
     await broadcast_update()
     return {"status": "success", "message": f"Todo von {update.pc_id} hinzugefügt"}
 
+@app.post("/api/todos")
+async def receive_todos(update: TodoBatchUpdate):
+    """Empfange mehrere Todos von Workshop-PC in einem Request"""
+    dashboard.add_todos(update)
+    await broadcast_update()
+    return {"status": "success", "message": f"{len(update.tasks)} Todos von {update.pc_id} hinzugefügt"}
+
 @app.post("/api/mood")
 async def receive_mood(update: MoodUpdate):
     """Empfange Stimmungs-Update von Workshop-PC"""
@@ -341,7 +535,17 @@ async def receive_tug(update: TugUpdate):
     """Empfange Tauziehen-Update von Workshop-PC"""
     dashboard.update_tug(update)
     await broadcast_update()
-    return {"status": "success", "message": f"Tauziehen von {update.pc_id}: {update.direction}"}
+    return {"status": "success", "message": f"Tauziehen von {update.pc_id}: {update.direction} x{update.count}"}
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: der Prozess antwortet"""
+    return PlainTextResponse("ok")
+
+@app.get("/readyz")
+async def readyz():
+    """Readiness: Daten geladen, bereit für Updates"""
+    return JSONResponse(startup_state, status_code=200 if startup_state["ready"] else 503)
 
 # BONUS: Reset-Endpoint für Admin
 @app.post("/api/reset")
@@ -677,7 +881,14 @@ async def dashboard_page():
           try{
             ws = new WebSocket(WS_URL);
             ws.onopen = () => { setStatus(true,'Live'); backoff = 800; stopPolling(); };
-            ws.onmessage = (ev) => updateDashboard(JSON.parse(ev.data));
+            ws.onmessage = (ev) => {
+              const data = JSON.parse(ev.data);
+              updateDashboard(data);
+              // Tracing: nach dem Zeichnen des Frames die Trace-IDs bestätigen
+              if(data.frame_id){
+                requestAnimationFrame(()=> { try{ ws.send(JSON.stringify({frame_ack: data.frame_id})); }catch(e){} });
+              }
+            };
             ws.onclose = () => {
               setStatus(false,'Getrennt – Reconnect…');
               startPolling();
@@ -861,8 +1072,9 @@ if __name__ == "__main__":
     print(f"💾 Daten werden in 'workshop_data.json' gespeichert")
     print("🚀 " + "="*50)
     
+    import uvicorn
     uvicorn.run(
-        "dashboard_server:app",
+        app,  # App-Objekt statt Import-String: Modul wird nicht ein zweites Mal geladen
         host="0.0.0.0",  # Auf allen Interfaces hören
         port=port,
         reload=False,
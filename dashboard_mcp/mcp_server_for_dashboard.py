@@ -4,20 +4,37 @@ Zentraler Workshop Personal Assistant MCP Server
 Läuft auf einem zentralen Server und bedient alle Workshop-PCs
 """
 
+import time
+STARTUP_T0 = time.perf_counter()  # Startzeit-Messung, vor allen schweren Imports
+
+import asyncio
+import bisect
+import contextvars
+import hashlib
+import heapq
+import inspect
 import json
 import os
 import platform
 import socket
-import webbrowser
-from datetime import datetime
+import sqlite3
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from functools import lru_cache, wraps
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Literal, Optional, TypedDict
 import threading
-import time
 
-import psutil
-import requests
+# psutil und requests werden erst in den Hintergrund-Threads bzw. beim ersten
+# Dashboard-Aufruf importiert, damit der Server schneller Verbindungen annimmt
 from fastmcp import FastMCP
+from fastmcp.server.dependencies import get_http_request
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from starlette.responses import JSONResponse, PlainTextResponse
+
+from workshop_tracing import TraceLog, percentile
 
 import sys
 import io
@@ -32,6 +49,16 @@ HOST = os.getenv("MCP_HOST", "0.0.0.0")  # Alle Interfaces
 PORT = int(os.getenv("MCP_PORT", "8082"))
 DASHBOARD_URL = os.getenv("DASHBOARD_URL", "http://localhost:8080")
 
+# Stateless Streamable-HTTP: keine Server-Sessions pro Verbindung, mehrere
+# Worker-Prozesse (je eigener MCP_PORT) können hinter einem Reverse-Proxy laufen
+STATELESS_HTTP = os.getenv("MCP_STATELESS", "0") == "1"
+USE_SHARED_STORE = os.getenv("MCP_SHARED_STORE", "1" if STATELESS_HTTP else "0") == "1"
+
+# Eingebetteter Modus: Dashboard läuft im selben Prozess und Event-Loop,
+# Tool-Events gehen über einen In-Memory-Bus statt per HTTP
+EMBED_DASHBOARD = os.getenv("MCP_EMBED_DASHBOARD", "0") == "1"
+DASHBOARD_PORT = int(os.getenv("DASHBOARD_PORT", "8080"))
+
 # Server-ID
 SERVER_ID = socket.gethostname()
 
@@ -40,18 +67,45 @@ mcp = FastMCP(f"Central Workshop Assistant")
 
 # Zentrale Daten-Dateien
 DATA_DIR = Path("workshop_data")
-DATA_DIR.mkdir(exist_ok=True)
 
 CENTRAL_NOTES_FILE = DATA_DIR / "central_notes.json"
 CENTRAL_CONTACTS_FILE = DATA_DIR / "central_contacts.json"
 CLIENT_SESSIONS_FILE = DATA_DIR / "client_sessions.json"
+SHARED_STORE_FILE = DATA_DIR / "workshop_state.sqlite3"
+
+# End-to-End-Tracing: Tool-Aufruf -> Dashboard -> WebSocket-Frame (trace_report.py wertet aus)
+TRACE_ENABLED = os.getenv("WORKSHOP_TRACE", "0") == "1"
+TRACE_FILE = Path(os.getenv("TRACE_FILE", str(DATA_DIR / "traces.jsonl")))
 
 # Client-Session Tracking
-active_clients = {}
-client_lock = threading.Lock()
+SESSION_TIMEOUT = 300  # Sekunden ohne Request bis ein Client als inaktiv gilt
+SUMMARY_CACHE_TTL = float(os.getenv("SUMMARY_CACHE_TTL", "1"))  # Sekunden, so alt dürfen Top-N und Raten sein
+
+# System-Metriken (Hintergrund-Sampler)
+METRICS_SAMPLE_INTERVAL = float(os.getenv("METRICS_SAMPLE_INTERVAL", "5"))  # Sekunden
+METRICS_WINDOW = int(os.getenv("METRICS_WINDOW", "60"))  # Anzahl Proben im Fenster
+
+# Obergrenzen für get_todos(limit=...) und get_workshop_status(limit=...)
+MAX_TODO_PAGE_SIZE = 200
+MAX_STATUS_PAGE_SIZE = 200
+
+# Render-Cache für statische Resource-/Prompt-Texte
+RENDER_CACHE_TTL = float(os.getenv("RENDER_CACHE_TTL", "300"))  # Sekunden
+
+# Idempotenz-Fenster für Tool-Wiederholungen, optional (0 = aus, z.B. 30 zum Einschalten)
+IDEMPOTENCY_WINDOW = float(os.getenv("IDEMPOTENCY_WINDOW", "0"))  # Sekunden
+IDEMPOTENCY_MAX_ENTRIES = 2048
+
+# Rate-Limits je Client und Tool-Kategorie: (Tokens pro Sekunde, Burst), Rate 0 = aus
+RATE_LIMITS = {
+    "tug": (float(os.getenv("TUG_RATE", "2")), int(os.getenv("TUG_BURST", "5"))),
+    "mood": (float(os.getenv("MOOD_RATE", "0.2")), int(os.getenv("MOOD_BURST", "3"))),
+}
+RATE_LIMIT_FLUSH_INTERVAL = 0.5  # Sekunden zwischen zwei Sammel-Events
 
 def ensure_data_files():
     """Stelle sicher, dass zentrale Daten-Dateien existieren"""
+    DATA_DIR.mkdir(exist_ok=True)
     if not CENTRAL_NOTES_FILE.exists():
         CENTRAL_NOTES_FILE.write_text(json.dumps({
             "global_todos": ["Workshop erfolgreich abschließen", "MCP Server zentral testen"],
@@ -73,73 +127,375 @@ def ensure_data_files():
             "sessions": {}
         }, indent=2))
 
-def get_client_id(request) -> str:
-    """Ermittle Client-ID aus Request-Headers mit Fallback"""
-    import hashlib
-    import uuid
-    from datetime import datetime
-    
-    with client_lock:
-        # 1. Priorität: Explizite Client-ID im Header
-        if client_id := request.headers.get("X-Client-ID"):
-            if client_id in active_clients:
-                active_clients[client_id]["last_seen"] = datetime.now().isoformat()
-                active_clients[client_id]["requests_count"] += 1
-                return client_id
-        
-        # 2. Priorität: Session-Token im Header
-        if session_token := request.headers.get("Authorization"):
-            client_id = f"session-{hashlib.md5(session_token.encode()).hexdigest()[:8]}"
-            if client_id not in active_clients:
-                active_clients[client_id] = create_new_session(client_id)
+# =============================================================================
+# CLIENT-SESSIONS
+# =============================================================================
+
+class ClientSessionTable:
+    """Client-Sessions mit monotonen Zeitstempeln und Heap-basiertem Ablauf
+
+    Jede Session hält ihren letzten Kontakt als time.monotonic()-Wert. Der
+    Heap enthält pro Session genau einen Eintrag (deadline, client_id); beim
+    Ablauf werden nur fällige Einträge angefasst. Ist eine Session seit dem
+    Einfügen erneut aktiv gewesen, wird ihr Eintrag mit der neuen Deadline
+    zurückgelegt statt bei jedem Request einen neuen Eintrag zu pushen.
+    """
+
+    def __init__(self, timeout: float = SESSION_TIMEOUT):
+        self.timeout = timeout
+        self._sessions: Dict[str, dict] = {}
+        self._expiry_heap: List[tuple] = []
+        self._lock = threading.Lock()
+        self.total_requests = 0  # Summe über alle aktiven Sessions, inkrementell gepflegt
+        self._summary_cache = (0.0, None, None)  # (berechnet um, top_n, Ergebnis)
+
+    def __contains__(self, client_id: str) -> bool:
+        return client_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def touch(self, client_id: str, fingerprint: str = None) -> dict:
+        """Registriere einen Request; legt die Session bei Bedarf an"""
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.get(client_id)
+            if session is None:
+                session = {
+                    "fingerprint": fingerprint,
+                    "first_seen": datetime.now().isoformat(),
+                    "first_seen_mono": now,
+                    "last_seen_mono": now,
+                    "requests_count": 1
+                }
+                self._sessions[client_id] = session
+                heapq.heappush(self._expiry_heap, (now + self.timeout, client_id))
             else:
-                update_session(client_id)
-            return client_id
-        
-        # 3. Fallback: Fingerprint aus User-Agent + IP
-        user_agent = request.headers.get("User-Agent", "unknown")
-        client_ip = request.client.host
-        fingerprint = f"{client_ip}:{user_agent}"
-        client_id = f"fp-{hashlib.md5(fingerprint.encode()).hexdigest()[:8]}"
-        
-        if client_id not in active_clients:
-            active_clients[client_id] = create_new_session(client_id, fingerprint)
-        else:
-            update_session(client_id)
-            
-        return client_id
+                session["last_seen_mono"] = now
+                session["requests_count"] += 1
+            self.total_requests += 1
+            return session
 
-def create_new_session(client_id: str, fingerprint: str = None) -> dict:
-    return {
-        "fingerprint": fingerprint,
-        "first_seen": datetime.now().isoformat(),
-        "last_seen": datetime.now().isoformat(),
-        "requests_count": 1
-    }
+    def track(self, client_id: str) -> bool:
+        """Zähle einen Request für eine bereits bekannte Session"""
+        with self._lock:
+            session = self._sessions.get(client_id)
+            if session is None:
+                return False
+            session["last_seen_mono"] = time.monotonic()
+            session["requests_count"] += 1
+            self.total_requests += 1
+            return True
+
+    def expire(self) -> List[str]:
+        """Entferne alle fälligen Sessions, O(k log n) für k fällige Einträge"""
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                _, client_id = heapq.heappop(self._expiry_heap)
+                session = self._sessions.get(client_id)
+                if session is None:
+                    continue
+                deadline = session["last_seen_mono"] + self.timeout
+                if deadline > now:
+                    # Zwischenzeitlich aktiv gewesen -> mit neuer Deadline zurücklegen
+                    heapq.heappush(self._expiry_heap, (deadline, client_id))
+                else:
+                    del self._sessions[client_id]
+                    self.total_requests -= session["requests_count"]
+                    expired.append(client_id)
+        return expired
+
+    def seconds_until_next_expiry(self) -> float:
+        """Zeit bis zum nächsten Heap-Eintrag (None wenn leer)"""
+        with self._lock:
+            if not self._expiry_heap:
+                return None
+            return max(0.0, self._expiry_heap[0][0] - time.monotonic())
+
+    @staticmethod
+    def _export(sessions: Dict[str, dict]) -> Dict[str, dict]:
+        """Ersetze die monotonen Zeitstempel kopierter Sessions durch ISO-Zeitstempel"""
+        now_mono = time.monotonic()
+        now_wall = datetime.now()
+        for session in sessions.values():
+            session.pop("first_seen_mono", None)
+            idle = now_mono - session.pop("last_seen_mono")
+            session["last_seen"] = (now_wall - timedelta(seconds=idle)).isoformat()
+        return sessions
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Kopie aller Sessions; last_seen wird als ISO-Zeitstempel ergänzt"""
+        with self._lock:
+            sessions = {cid: dict(session) for cid, session in self._sessions.items()}
+        return self._export(sessions)
+
+    def page(self, offset: int, limit: int) -> Dict[str, dict]:
+        """Kopie eines Ausschnitts der Sessions (in Reihenfolge des ersten Kontakts)"""
+        with self._lock:
+            sessions = {cid: dict(session)
+                        for cid, session in islice(self._sessions.items(), offset, offset + limit)}
+        return self._export(sessions)
+
+    def totals(self) -> dict:
+        """Nur die Zähler, ohne über alle Sessions zu laufen"""
+        with self._lock:
+            return {"active_clients": len(self._sessions), "total_requests": self.total_requests}
+
+    def summary(self, top_n: int = 5) -> dict:
+        """Zähler, aktivste Clients und Requests/Minute je Client
+
+        Die Zähler sind immer aktuell. Top-N und Raten brauchen einen Lauf über
+        alle Sessions (die Raten ändern sich mit der Zeit auch ohne Request,
+        lassen sich also nicht in touch() mitführen); der Lauf wird daher
+        höchstens alle SUMMARY_CACHE_TTL Sekunden gemacht, egal wie oft
+        Clients den Status abfragen.
+        """
+        now = time.monotonic()
+        computed_at, cached_top_n, cached = self._summary_cache
+        if cached is None or cached_top_n != top_n or now - computed_at >= SUMMARY_CACHE_TTL:
+            with self._lock:
+                rows = [(session["requests_count"], cid, session["first_seen_mono"])
+                        for cid, session in self._sessions.items()]
+            cached = {
+                "top_clients": [(cid, count) for count, cid, _ in heapq.nlargest(top_n, rows)],
+                "rates_per_minute": [count * 60 / max(60.0, now - first) for count, _, first in rows],
+            }
+            self._summary_cache = (now, top_n, cached)
+        return {**self.totals(), **cached}
+
+# =============================================================================
+# GETEILTER STORE (STATELESS-HTTP MIT MEHREREN WORKERN)
+# =============================================================================
+
+class SharedStore:
+    """SQLite-Datei als gemeinsamer Zustand für mehrere Worker-Prozesse
+
+    Sessions und Notes liegen in einer WAL-Datenbank im DATA_DIR, damit
+    mehrere Server-Prozesse hinter einem lokalen Reverse-Proxy denselben
+    Zustand sehen. Schreibende Zugriffe laufen in BEGIN IMMEDIATE-Transaktionen.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._local = threading.local()
+        with self.transaction() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS sessions (
+                client_id TEXT PRIMARY KEY,
+                fingerprint TEXT,
+                first_seen TEXT NOT NULL,
+                last_seen REAL NOT NULL,
+                requests_count INTEGER NOT NULL)""")
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_last_seen ON sessions (last_seen)")
+            conn.execute("CREATE TABLE IF NOT EXISTS documents (name TEXT PRIMARY KEY, body TEXT NOT NULL)")
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def load_document(self, name: str, default_file: Path) -> dict:
+        row = self.conn.execute("SELECT body FROM documents WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            # Erster Zugriff: bestehende JSON-Datei übernehmen
+            with self.transaction() as conn:
+                body = default_file.read_text(encoding='utf-8')
+                conn.execute("INSERT OR IGNORE INTO documents (name, body) VALUES (?, ?)", (name, body))
+            return self.load_document(name, default_file)
+        return json.loads(row[0])
+
+    def update_document(self, name: str, default_file: Path, mutate) -> Any:
+        """Lese-Ändere-Schreibe atomar über alle Prozesse hinweg"""
+        self.load_document(name, default_file)
+        with self.transaction() as conn:
+            data = json.loads(conn.execute("SELECT body FROM documents WHERE name = ?", (name,)).fetchone()[0])
+            result = mutate(data)
+            conn.execute("UPDATE documents SET body = ? WHERE name = ?", (json.dumps(data, ensure_ascii=False), name))
+        return result
+
+class SqliteSessionTable:
+    """Session-Tabelle im SharedStore, gleiche Schnittstelle wie ClientSessionTable
+
+    Prozessübergreifend wird Wall-Clock-Zeit gespeichert; der Index auf
+    last_seen sorgt dafür, dass expire() nur fällige Zeilen anfasst.
+    """
 
-def update_session(client_id: str):
-    active_clients[client_id]["last_seen"] = datetime.now().isoformat()
-    active_clients[client_id]["requests_count"] += 1
+    def __init__(self, store: SharedStore, timeout: float = SESSION_TIMEOUT):
+        self.store = store
+        self.timeout = timeout
 
-def track_client_request(client_id: str):
-    """Tracke Client-Request"""
-    with client_lock:
-        if client_id in active_clients:
-            active_clients[client_id]["requests_count"] += 1
-            active_clients[client_id]["last_seen"] = datetime.now().isoformat()
+    def __contains__(self, client_id: str) -> bool:
+        return self.store.conn.execute(
+            "SELECT 1 FROM sessions WHERE client_id = ?", (client_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.store.conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def touch(self, client_id: str, fingerprint: str = None) -> dict:
+        """Registriere einen Request; liefert die Session wie page() (last_seen als ISO-Zeitstempel)"""
+        with self.store.transaction() as conn:
+            conn.execute("""INSERT INTO sessions (client_id, fingerprint, first_seen, last_seen, requests_count)
+                VALUES (?, ?, ?, ?, 1)
+                ON CONFLICT (client_id) DO UPDATE SET
+                    last_seen = excluded.last_seen,
+                    requests_count = requests_count + 1""",
+                (client_id, fingerprint, datetime.now().isoformat(), time.time()))
+            row = conn.execute(
+                "SELECT fingerprint, first_seen, last_seen, requests_count FROM sessions WHERE client_id = ?",
+                (client_id,)).fetchone()
+        return self._session(*row)
+
+    @staticmethod
+    def _session(fingerprint: str, first_seen: str, last_seen: float, requests_count: int) -> dict:
+        return {
+            "fingerprint": fingerprint,
+            "first_seen": first_seen,
+            "last_seen": datetime.fromtimestamp(last_seen).isoformat(),
+            "requests_count": requests_count
+        }
+
+    def track(self, client_id: str) -> bool:
+        with self.store.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE sessions SET last_seen = ?, requests_count = requests_count + 1 WHERE client_id = ?",
+                (time.time(), client_id))
+            return cursor.rowcount > 0
+
+    def expire(self) -> List[str]:
+        cutoff = time.time() - self.timeout
+        with self.store.transaction() as conn:
+            expired = [row[0] for row in conn.execute(
+                "SELECT client_id FROM sessions WHERE last_seen <= ?", (cutoff,))]
+            conn.execute("DELETE FROM sessions WHERE last_seen <= ?", (cutoff,))
+        return expired
+
+    def seconds_until_next_expiry(self) -> float:
+        row = self.store.conn.execute("SELECT MIN(last_seen) FROM sessions").fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] + self.timeout - time.time())
+
+    def snapshot(self) -> Dict[str, dict]:
+        return self.page(0, -1)
+
+    def page(self, offset: int, limit: int) -> Dict[str, dict]:
+        rows = self.store.conn.execute(
+            "SELECT client_id, fingerprint, first_seen, last_seen, requests_count FROM sessions "
+            "ORDER BY rowid LIMIT ? OFFSET ?", (limit, offset)).fetchall()
+        return {client_id: self._session(*session) for client_id, *session in rows}
+
+    def totals(self) -> dict:
+        active_clients, total_requests = self.store.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(requests_count), 0) FROM sessions").fetchone()
+        return {"active_clients": active_clients, "total_requests": total_requests}
+
+    def summary(self, top_n: int = 5) -> dict:
+        conn = self.store.conn
+        totals = self.totals()
+        top_clients = conn.execute(
+            "SELECT client_id, requests_count FROM sessions ORDER BY requests_count DESC LIMIT ?",
+            (top_n,)).fetchall()
+        now = time.time()
+        rates = [
+            count * 60 / max(60.0, now - datetime.fromisoformat(first_seen).timestamp())
+            for count, first_seen in conn.execute("SELECT requests_count, first_seen FROM sessions")
+        ]
+        return {
+            **totals,
+            "top_clients": [tuple(row) for row in top_clients],
+            "rates_per_minute": rates,
+        }
+
+if USE_SHARED_STORE:
+    ensure_data_files()
+    shared_store = SharedStore(SHARED_STORE_FILE)
+    active_clients = SqliteSessionTable(shared_store)
+else:
+    shared_store = None
+    active_clients = ClientSessionTable()
+
+@lru_cache(maxsize=4096)
+def hashed_client_id(prefix: str, key: str) -> str:
+    """Stabile Kurz-ID aus Session-Token oder Fingerprint (gecacht)"""
+    return f"{prefix}-{hashlib.md5(key.encode()).hexdigest()[:8]}"
+
+# Client-ID des laufenden MCP-Requests, einmal pro Request aufgelöst
+current_client: contextvars.ContextVar = contextvars.ContextVar("current_client", default=None)
+
+def client_identity(request) -> tuple:
+    """(client_id, fingerprint) aus Request-Headers, ohne die Session-Tabelle zu verändern"""
+    # 1. Priorität: Explizite Client-ID im Header
+    if client_id := request.headers.get("X-Client-ID"):
+        return client_id, None
+
+    # 2. Priorität: Session-Token im Header
+    if session_token := request.headers.get("Authorization"):
+        return hashed_client_id("session", session_token), None
+
+    # 3. Fallback: Fingerprint aus User-Agent + IP
+    user_agent = request.headers.get("User-Agent", "unknown")
+    client_ip = request.client.host if request.client else "unknown"
+    fingerprint = f"{client_ip}:{user_agent}"
+    return hashed_client_id("fp", fingerprint), fingerprint
+
+def resolve_client() -> tuple:
+    """Client des aktuellen HTTP-Requests registrieren und die ContextVar setzen
+
+    Liefert (client_id, Reset-Token der ContextVar). Ohne HTTP-Request
+    (z.B. In-Memory-Client) gilt der Aufrufer als "local".
+    """
+    try:
+        client_id, fingerprint = client_identity(get_http_request())
+    except RuntimeError:
+        client_id, fingerprint = "local", None
+    active_clients.touch(client_id, fingerprint)
+    return client_id, current_client.set(client_id)
+
+def get_client_id() -> str:
+    """Client-ID des laufenden Requests (von der Middleware bereits aufgelöst)"""
+    client_id = current_client.get()
+    if client_id is None:
+        client_id, _ = resolve_client()  # Aufruf außerhalb der Middleware
+    return client_id
+
+# Event-Bus des eingebetteten Dashboards (nur im eingebetteten Modus gesetzt)
+dashboard_bus = None
 
 def send_to_dashboard(endpoint: str, data: dict) -> bool:
     """Sende Update an Dashboard-Server"""
-    try:
-        response = requests.post(
-            f"{DASHBOARD_URL}/api/{endpoint}",
-            json=data,
-            timeout=2
-        )
-        return response.status_code == 200
-    except Exception as e:
-        print(f"⚠️ Dashboard-Update fehlgeschlagen: {e}")
-        return False
+    trace_id = current_trace.get()
+    with call_metrics.span("send_to_dashboard"), trace_log.span("send_to_dashboard", endpoint):
+        if dashboard_bus is not None:
+            return dashboard_bus.publish(endpoint, data, trace_id)
+        try:
+            import requests
+            response = requests.post(
+                f"{DASHBOARD_URL}/api/{endpoint}",
+                json=data,
+                headers={"X-Trace-ID": trace_id} if trace_id else None,
+                timeout=2
+            )
+            return response.status_code == 200
+        except Exception as e:
+            print(f"⚠️ Dashboard-Update fehlgeschlagen: {e}")
+            return False
 
 def track_tool_usage(tool_name: str):
     """Helper um Tool Usage zu tracken"""
@@ -150,6 +506,762 @@ def track_tool_usage(tool_name: str):
         "timestamp": datetime.now().isoformat()
     })
 
+notes_lock = threading.Lock()
+
+def load_notes() -> dict:
+    """Lese die zentrale Notes-Datei"""
+    with call_metrics.span("notes_read"):
+        ensure_data_files()
+        if shared_store is not None:
+            return shared_store.load_document("notes", CENTRAL_NOTES_FILE)
+        return json.loads(CENTRAL_NOTES_FILE.read_text())
+
+def update_notes(mutate):
+    """Ändere die Notes atomar; mutate(data) bekommt das Dict und darf es verändern"""
+    with call_metrics.span("notes_write"):
+        ensure_data_files()
+        if shared_store is not None:
+            return shared_store.update_document("notes", CENTRAL_NOTES_FILE, mutate)
+        with notes_lock:
+            data = json.loads(CENTRAL_NOTES_FILE.read_text())
+            result = mutate(data)
+            CENTRAL_NOTES_FILE.write_text(json.dumps(data, indent=2), encoding='utf-8')
+        return result
+
+# =============================================================================
+# SYSTEM-METRIKEN
+# =============================================================================
+
+# Kennzahlen für die Verlaufs-Resource
+METRICS_HISTORY_KEYS = ["cpu_percent", "memory_percent", "disk_percent", "net_sent_per_s", "net_recv_per_s"]
+
+class SystemMetricsSampler:
+    """Sammelt CPU-, Speicher-, Platten- und Netzwerkwerte im Hintergrund
+
+    Ein Daemon-Thread nimmt alle `interval` Sekunden eine Probe und legt sie in
+    einem Ringpuffer der Länge `window` ab. Tools lesen nur die letzte Probe
+    und blockieren dadurch nie auf psutil.cpu_percent(interval=...).
+    """
+
+    def __init__(self, interval: float = METRICS_SAMPLE_INTERVAL, window: int = METRICS_WINDOW):
+        self.interval = interval
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._last_net = None
+
+    def start(self):
+        """Starte den Sampler-Thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        import psutil
+        # Erster Aufruf liefert 0.0 und setzt nur den Referenzpunkt für cpu_percent
+        psutil.cpu_percent(interval=None)
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"❌ Metrics sampler error: {e}")
+            time.sleep(self.interval)
+
+    def sample(self) -> dict:
+        """Nimm eine einzelne, nicht-blockierende Probe"""
+        import psutil
+        now = time.monotonic()
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        net = psutil.net_io_counters()
+
+        sent_rate = recv_rate = 0.0
+        if self._last_net is not None:
+            last_time, last_sent, last_recv = self._last_net
+            elapsed = now - last_time
+            if elapsed > 0:
+                sent_rate = max(0, net.bytes_sent - last_sent) / elapsed
+                recv_rate = max(0, net.bytes_recv - last_recv) / elapsed
+        self._last_net = (now, net.bytes_sent, net.bytes_recv)
+
+        sample = {
+            "timestamp": datetime.now().isoformat(),
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "memory_percent": memory.percent,
+            "memory_used": memory.used,
+            "memory_total": memory.total,
+            "disk_percent": disk.percent,
+            "disk_used": disk.used,
+            "disk_total": disk.total,
+            "net_bytes_sent": net.bytes_sent,
+            "net_bytes_recv": net.bytes_recv,
+            "net_sent_per_s": sent_rate,
+            "net_recv_per_s": recv_rate,
+        }
+        with self._lock:
+            self.samples.append(sample)
+        return sample
+
+    def latest(self) -> dict:
+        """Letzte Probe; startet den Sampler falls er noch nicht läuft"""
+        with self._lock:
+            if self.samples:
+                return self.samples[-1]
+        self.start()
+        return self.sample()
+
+    def history(self) -> Dict[str, dict]:
+        """Min/Avg/Max je Kennzahl über das aktuelle Fenster"""
+        with self._lock:
+            samples = list(self.samples)
+        stats = {}
+        for key in METRICS_HISTORY_KEYS:
+            values = [s[key] for s in samples]
+            if values:
+                stats[key] = {
+                    "min": min(values),
+                    "avg": sum(values) / len(values),
+                    "max": max(values),
+                }
+        return {"samples": len(samples), "interval": self.interval, "stats": stats}
+
+system_metrics = SystemMetricsSampler()
+
+# =============================================================================
+# RENDER-CACHE FÜR RESOURCES & PROMPTS
+# =============================================================================
+
+class RenderCache:
+    """Cache für gerenderte Resource-/Prompt-Texte mit Hit/Miss-Zählern
+
+    Einträge werden über Funktionsname und Argumente adressiert. Mit `source`
+    ist ein Eintrag gültig, solange mtime und Größe der Quelldatei gleich
+    bleiben; mit `ttl` läuft er nach der angegebenen Zeit ab. Per-Client-Felder
+    (Client-ID, Uhrzeit) gehören nicht in gecachte Funktionen.
+    """
+
+    def __init__(self):
+        self._entries: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def cached(self, source: Path = None, ttl: float = None):
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                key = (func.__name__, args, tuple(sorted(kwargs.items())))
+                version = None
+                if source is not None:
+                    try:
+                        stat = source.stat()
+                        version = (stat.st_mtime_ns, stat.st_size)
+                    except FileNotFoundError:
+                        pass
+                now = time.monotonic()
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry and entry[0] == version and (entry[1] is None or entry[1] > now):
+                        self.hits += 1
+                        return entry[2]
+                    self.misses += 1
+                
+                value = func(*args, **kwargs)
+                expires = now + ttl if ttl is not None else None
+                with self._lock:
+                    self._entries[key] = (version, expires, value)
+                return value
+            return wrapper
+        return decorator
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+render_cache = RenderCache()
+
+# =============================================================================
+# CALL-METRIKEN (LATENZ, FEHLER, CLIENTS)
+# =============================================================================
+
+# Histogramm-Grenzen in Sekunden
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+CLIENT_RATE_WINDOW = 60  # Sekunden für Requests/Minute pro Client
+MAX_METRIC_CLIENTS = int(os.getenv("MAX_METRIC_CLIENTS", "500"))  # Clients in den Metriken, älteste fliegen raus
+
+# Aktueller Tool-/Resource-/Prompt-Aufruf (für Sub-Spans)
+current_call: contextvars.ContextVar = contextvars.ContextVar("current_call", default=None)
+
+# Trace-ID des laufenden Tool-Aufrufs (geht per X-Trace-ID ans Dashboard)
+current_trace: contextvars.ContextVar = contextvars.ContextVar("current_trace", default=None)
+
+def prom_label(value) -> str:
+    """Label-Wert für das Prometheus-Textformat escapen (\\, " und Zeilenumbruch)"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+class CallMetrics:
+    """Latenz-Histogramme, Fehlerzähler, Client-Raten und Sub-Spans
+
+    Aufrufe werden nach (kind, name) gruppiert, z.B. ("tool", "tug_left").
+    Sub-Spans wie send_to_dashboard oder der Notes-Datei-Zugriff werden
+    zusätzlich unter dem gerade laufenden Aufruf abgelegt, damit sich die
+    Latenz eines Tools in Dashboard-Hop und Datei-I/O zerlegen lässt.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: Dict[tuple, dict] = {}
+        self.spans: Dict[tuple, dict] = {}
+        self.client_totals: OrderedDict = OrderedDict()  # LRU: zuletzt aktive Clients hinten
+        self.client_recent: Dict[str, deque] = {}
+
+    def observe_call(self, kind: str, name: str, duration: float, ok: bool):
+        with self._lock:
+            entry = self.calls.get((kind, name))
+            if entry is None:
+                entry = {"count": 0, "errors": 0, "sum": 0.0, "buckets": [0] * (len(LATENCY_BUCKETS) + 1)}
+                self.calls[(kind, name)] = entry
+            entry["count"] += 1
+            entry["sum"] += duration
+            if not ok:
+                entry["errors"] += 1
+            entry["buckets"][bisect.bisect_left(LATENCY_BUCKETS, duration)] += 1
+
+    def observe_client(self, client_id: str):
+        now = time.monotonic()
+        with self._lock:
+            self.client_totals[client_id] = self.client_totals.get(client_id, 0) + 1
+            self.client_totals.move_to_end(client_id)
+            recent = self.client_recent.setdefault(client_id, deque())
+            recent.append(now)
+            while recent and recent[0] < now - CLIENT_RATE_WINDOW:
+                recent.popleft()
+            while len(self.client_totals) > MAX_METRIC_CLIENTS:
+                stale, _ = self.client_totals.popitem(last=False)
+                self.client_recent.pop(stale, None)
+
+    @contextmanager
+    def span(self, name: str):
+        """Miss einen Teilschritt innerhalb des aktuellen Aufrufs"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            call = current_call.get() or "-"
+            with self._lock:
+                entry = self.spans.setdefault((call, name), {"count": 0, "sum": 0.0, "max": 0.0})
+                entry["count"] += 1
+                entry["sum"] += duration
+                entry["max"] = max(entry["max"], duration)
+
+    def client_rates(self) -> Dict[str, float]:
+        """Requests pro Minute je Client über das Raten-Fenster"""
+        cutoff = time.monotonic() - CLIENT_RATE_WINDOW
+        with self._lock:
+            return {
+                cid: sum(1 for t in recent if t >= cutoff) * 60 / CLIENT_RATE_WINDOW
+                for cid, recent in self.client_recent.items()
+            }
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            calls = {key: dict(entry, buckets=list(entry["buckets"])) for key, entry in self.calls.items()}
+            spans = {key: dict(entry) for key, entry in self.spans.items()}
+            client_totals = dict(self.client_totals)
+        return {"calls": calls, "spans": spans, "client_totals": client_totals, "client_rates": self.client_rates()}
+
+    def render_text(self) -> str:
+        """Metriken im Prometheus-Textformat"""
+        snap = self.snapshot()
+        lines = [
+            "# HELP mcp_call_duration_seconds Dauer von Tool-/Resource-/Prompt-Aufrufen",
+            "# TYPE mcp_call_duration_seconds histogram",
+        ]
+        for (kind, name), entry in sorted(snap["calls"].items()):
+            labels = f'kind="{prom_label(kind)}",name="{prom_label(name)}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), entry["buckets"]):
+                cumulative += count
+                lines.append(f'mcp_call_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"mcp_call_duration_seconds_sum{{{labels}}} {entry['sum']:.6f}")
+            lines.append(f"mcp_call_duration_seconds_count{{{labels}}} {entry['count']}")
+
+        lines += ["# HELP mcp_call_errors_total Fehlgeschlagene Aufrufe", "# TYPE mcp_call_errors_total counter"]
+        for (kind, name), entry in sorted(snap["calls"].items()):
+            lines.append(f'mcp_call_errors_total{{kind="{prom_label(kind)}",name="{prom_label(name)}"}} {entry["errors"]}')
+
+        lines += ["# HELP mcp_span_duration_seconds Teilschritte je Aufruf", "# TYPE mcp_span_duration_seconds summary"]
+        for (call, span), entry in sorted(snap["spans"].items()):
+            labels = f'call="{prom_label(call)}",span="{prom_label(span)}"'
+            lines.append(f"mcp_span_duration_seconds_sum{{{labels}}} {entry['sum']:.6f}")
+            lines.append(f"mcp_span_duration_seconds_count{{{labels}}} {entry['count']}")
+
+        lines += ["# HELP mcp_client_calls_total Aufrufe je Client", "# TYPE mcp_client_calls_total counter"]
+        for cid, total in sorted(snap["client_totals"].items()):
+            lines.append(f'mcp_client_calls_total{{client="{prom_label(cid)}"}} {total}')
+        lines += ["# HELP mcp_client_calls_per_minute Aufrufrate je Client", "# TYPE mcp_client_calls_per_minute gauge"]
+        for cid, rate in sorted(snap["client_rates"].items()):
+            lines.append(f'mcp_client_calls_per_minute{{client="{prom_label(cid)}"}} {rate:.2f}')
+
+        cache = render_cache.stats()
+        lines += [
+            "# TYPE mcp_render_cache_hits_total counter",
+            f"mcp_render_cache_hits_total {cache['hits']}",
+            "# TYPE mcp_render_cache_misses_total counter",
+            f"mcp_render_cache_misses_total {cache['misses']}",
+        ]
+
+        dedup = idempotency_cache.stats()
+        lines += [
+            "# HELP mcp_idempotency_hits_total Wiederholte Tool-Aufrufe aus dem Idempotenz-Cache",
+            "# TYPE mcp_idempotency_hits_total counter",
+            f"mcp_idempotency_hits_total {dedup['hits']}",
+            "# TYPE mcp_idempotency_misses_total counter",
+            f"mcp_idempotency_misses_total {dedup['misses']}",
+            "# TYPE mcp_idempotency_entries gauge",
+            f"mcp_idempotency_entries {dedup['entries']}",
+        ]
+
+        limits = rate_limiter.stats()
+        lines += [
+            "# HELP mcp_rate_limit_events_total Dashboard-Events je Kategorie (sent = gesendet, deferred = gesammelt)",
+            "# TYPE mcp_rate_limit_events_total counter",
+        ]
+        for category in sorted(limits["sent"]):
+            lines.append(f'mcp_rate_limit_events_total{{category="{category}",outcome="sent"}} {limits["sent"][category]}')
+            lines.append(f'mcp_rate_limit_events_total{{category="{category}",outcome="deferred"}} {limits["deferred"][category]}')
+        lines += ["# TYPE mcp_rate_limit_pending gauge", f"mcp_rate_limit_pending {limits['pending']}"]
+        return "\n".join(lines) + "\n"
+
+call_metrics = CallMetrics()
+
+trace_log = TraceLog(TRACE_FILE, "mcp", TRACE_ENABLED, current_trace)
+
+class InstrumentationMiddleware(Middleware):
+    """Misst jeden Tool-, Resource- und Prompt-Aufruf"""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        return await self._measure("tool", context.message.name, call_next, context)
+
+    async def on_read_resource(self, context: MiddlewareContext, call_next):
+        return await self._measure("resource", str(context.message.uri), call_next, context)
+
+    async def on_get_prompt(self, context: MiddlewareContext, call_next):
+        return await self._measure("prompt", context.message.name, call_next, context)
+
+    async def _measure(self, kind: str, name: str, call_next, context: MiddlewareContext):
+        client_id, client_token = resolve_client()
+        call_metrics.observe_client(client_id)
+
+        token = current_call.set(name)
+        trace_token = current_trace.set(os.urandom(8).hex() if TRACE_ENABLED and kind == "tool" else None)
+        start = time.perf_counter()
+        ok = False
+        try:
+            with trace_log.span("mcp_tool", name):
+                result = await call_next(context)
+            ok = True
+            return result
+        finally:
+            call_metrics.observe_call(kind, name, time.perf_counter() - start, ok)
+            current_trace.reset(trace_token)
+            current_call.reset(token)
+            current_client.reset(client_token)
+
+mcp.add_middleware(InstrumentationMiddleware())
+
+# =============================================================================
+# IDEMPOTENZ (DEDUPLIZIERUNG VON TOOL-WIEDERHOLUNGEN)
+# =============================================================================
+
+# Tools mit Seiteneffekten: gleiche Argumente im Fenster gelten als Wiederholung
+IDEMPOTENT_TOOLS = {"workshop_add_todo", "workshop_add_todos", "workshop_set_mood"}
+
+# Tauziehen hat keine Argumente, jeder Aufruf ist ein echter Zug: über die
+# Argumente lässt sich ein Retry nicht von einem gewollten Pull unterscheiden.
+# Dedupliziert wird hier nur, wenn der Client eine Request-ID mitschickt.
+EXPLICIT_KEY_TOOLS = {"tug_left", "tug_right"}
+
+class IdempotencyCache:
+    """Begrenzter, zeitgefensterter Cache für Tool-Ergebnisse
+
+    Einträge halten ein Future: Eine Wiederholung, die eintrifft während der
+    erste Aufruf noch läuft (z.B. weil send_to_dashboard hängt), wartet auf
+    dessen Ergebnis statt die Seiteneffekte ein zweites Mal auszulösen.
+    Fehlgeschlagene Aufrufe werden nicht gecacht, damit ein Retry greifen kann.
+    """
+
+    def __init__(self, max_entries: int = IDEMPOTENCY_MAX_ENTRIES):
+        self._entries: OrderedDict = OrderedDict()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def _evict(self, now: float):
+        while self._entries:
+            key, (expires, _) = next(iter(self._entries.items()))
+            if expires > now and len(self._entries) <= self.max_entries:
+                break
+            self._entries.popitem(last=False)
+
+    async def run(self, key: tuple, window: float, call):
+        now = time.monotonic()
+        self._evict(now)
+        entry = self._entries.get(key)
+        if entry and entry[0] > now:
+            self.hits += 1
+            return await asyncio.shield(entry[1])
+        self.misses += 1
+
+        future = asyncio.get_running_loop().create_future()
+        self._entries.pop(key, None)
+        self._entries[key] = (now + window, future)
+        try:
+            result = await call()
+        except BaseException as e:
+            if self._entries.get(key, (None, None))[1] is future:
+                del self._entries[key]
+            future.set_exception(e)
+            future.exception()  # Als abgeholt markieren, falls niemand wartet
+            raise
+        future.set_result(result)
+        return result
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+idempotency_cache = IdempotencyCache()
+
+def idempotency_key(context: MiddlewareContext) -> Optional[str]:
+    """Explizite Request-ID aus `_meta.idempotency_key` oder dem Idempotency-Key-Header"""
+    try:
+        meta = context.fastmcp_context.request_context.meta
+    except (AttributeError, ValueError):
+        meta = None
+    if meta is not None and (key := getattr(meta, "idempotency_key", None)):
+        return str(key)
+    try:
+        return get_http_request().headers.get("Idempotency-Key")
+    except RuntimeError:
+        return None
+
+async def normalized_arguments(name: str, arguments: dict) -> str:
+    """Argumente als stabiler Schlüssel; weggelassene Defaults werden ergänzt
+
+    So gelten workshop_add_todos(tasks) und workshop_add_todos(tasks,
+    global_todo=False) als derselbe Aufruf.
+    """
+    try:
+        tool = await mcp.get_tool(name)
+        bound = inspect.signature(tool.fn).bind(**arguments)
+        bound.apply_defaults()
+        arguments = bound.arguments
+    except Exception:
+        pass  # Ungültige Argumente meldet der Aufruf selbst
+    return json.dumps(arguments, sort_keys=True, ensure_ascii=False, default=str)
+
+class IdempotencyMiddleware(Middleware):
+    """Beantwortet wiederholte Tool-Aufrufe innerhalb des Fensters aus dem Cache"""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        name = context.message.name
+        if IDEMPOTENCY_WINDOW <= 0 or name not in IDEMPOTENT_TOOLS | EXPLICIT_KEY_TOOLS:
+            return await call_next(context)
+
+        client = get_client_id()
+        if explicit := idempotency_key(context):
+            key = (client, name, "id", explicit)
+        elif name in IDEMPOTENT_TOOLS:
+            arguments = await normalized_arguments(name, context.message.arguments or {})
+            key = (client, name, "args", arguments)
+        else:
+            return await call_next(context)
+
+        return await idempotency_cache.run(key, IDEMPOTENCY_WINDOW, lambda: call_next(context))
+
+mcp.add_middleware(IdempotencyMiddleware())
+
+# =============================================================================
+# RATE-LIMITS FÜR TAUZIEHEN & STIMMUNG
+# =============================================================================
+
+class TokenBucket:
+    """Klassischer Token-Bucket: `rate` Tokens pro Sekunde, höchstens `burst`"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now: float) -> bool:
+        self.refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+class ClientRateLimiter:
+    """Begrenzt Dashboard-Events je Client und Kategorie
+
+    Ist der Bucket leer, wird das Event nicht verworfen, sondern unter
+    (Kategorie, Client, Schlüssel) gesammelt: Tauziehen summiert die Pulls,
+    bei der Stimmung gewinnt die letzte. Ein Hintergrund-Thread schickt die
+    Sammlung als ein Event mit `count` los, sobald wieder ein Token da ist.
+    So bleibt der Traffic zum Dashboard pro Client begrenzt, ohne dass Pulls
+    verloren gehen.
+    """
+
+    def __init__(self, limits: Dict[str, tuple]):
+        self.limits = limits
+        self._buckets: Dict[tuple, TokenBucket] = {}
+        self._pending: Dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+        self.sent: Dict[str, int] = {category: 0 for category in limits}
+        self.deferred: Dict[str, int] = {category: 0 for category in limits}
+
+    def _bucket(self, category: str, client_id: str) -> TokenBucket:
+        bucket = self._buckets.get((category, client_id))
+        if bucket is None:
+            bucket = TokenBucket(*self.limits[category])
+            self._buckets[(category, client_id)] = bucket
+        return bucket
+
+    def submit(self, category: str, client_id: str, kind: str, key: str, data: dict) -> Optional[dict]:
+        """Event anmelden; liefert den zu sendenden Payload oder None, wenn gesammelt wird
+
+        Der Payload enthält `count` inklusive bereits gesammelter Events mit
+        demselben Schlüssel.
+        """
+        rate, _ = self.limits[category]
+        with self._lock:
+            pending = self._pending.pop((category, client_id, key), None)
+            count = 1 + (pending["count"] if pending else 0)
+            if rate <= 0 or self._bucket(category, client_id).take(time.monotonic()):
+                self.sent[category] += 1
+                return dict(data, count=count)
+
+            self._pending[(category, client_id, key)] = {"kind": kind, "data": data, "count": count}
+            self.deferred[category] += 1
+            return None
+
+    def pending_count(self, category: str, client_id: str, key: str) -> int:
+        with self._lock:
+            pending = self._pending.get((category, client_id, key))
+            return pending["count"] if pending else 0
+
+    def ready(self) -> List[tuple]:
+        """Gesammelte Events, für die wieder ein Token frei ist: [(kind, payload), ...]"""
+        now = time.monotonic()
+        events = []
+        with self._lock:
+            for (category, client_id, key), pending in list(self._pending.items()):
+                if self._bucket(category, client_id).take(now):
+                    del self._pending[(category, client_id, key)]
+                    self.sent[category] += 1
+                    events.append((pending["kind"], dict(pending["data"], count=pending["count"])))
+
+            # Volle Buckets ohne Sammlung sind wie neu und können weg
+            waiting = {(category, client_id) for category, client_id, _ in self._pending}
+            for bucket_key, bucket in list(self._buckets.items()):
+                bucket.refill(now)
+                if bucket.tokens >= bucket.burst and bucket_key not in waiting:
+                    del self._buckets[bucket_key]
+        return events
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sent": dict(self.sent),
+                "deferred": dict(self.deferred),
+                "pending": len(self._pending),
+                "buckets": len(self._buckets),
+            }
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True, name="rate-limit-flush").start()
+
+    def _run(self):
+        while True:
+            try:
+                for kind, payload in self.ready():
+                    send_to_dashboard(kind, payload)
+            except Exception as e:
+                print(f"❌ Rate-Limit Flush error: {e}")
+            time.sleep(RATE_LIMIT_FLUSH_INTERVAL)
+
+rate_limiter = ClientRateLimiter(RATE_LIMITS)
+
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request) -> PlainTextResponse:
+    """Plain-Text-Metriken für curl/Prometheus"""
+    return PlainTextResponse(call_metrics.render_text())
+
+# Startzustand für /readyz: bereit, sobald uvicorn Verbindungen annimmt
+startup_state = {"ready": False, "ready_ms": None, "dashboard": "unbekannt"}
+
+@mcp.custom_route("/healthz", methods=["GET"])
+async def healthz_endpoint(request) -> PlainTextResponse:
+    """Liveness: der Prozess antwortet"""
+    return PlainTextResponse("ok")
+
+@mcp.custom_route("/readyz", methods=["GET"])
+async def readyz_endpoint(request) -> JSONResponse:
+    """Readiness: Daten-Dateien angelegt und Server gestartet (Dashboard optional)"""
+    return JSONResponse(startup_state, status_code=200 if startup_state["ready"] else 503)
+
+# =============================================================================
+# STRUKTURIERTE AUSGABEN
+# =============================================================================
+
+# Tools mit format="json" liefern kompakte Dicts statt Markdown; der Text wird
+# nur gebaut, wenn er wirklich angefragt wird.
+OutputFormat = Literal["markdown", "json"]
+
+class TodoItem(TypedDict):
+    scope: str  # "client" oder "global"
+    number: int
+    task: str
+
+class TodoPage(TypedDict):
+    client_id: str
+    own_count: int
+    total: int
+    offset: int
+    limit: int
+    next_offset: Optional[int]
+    items: List[TodoItem]
+
+class ClientInfo(TypedDict):
+    client_id: str
+    requests_count: int
+    last_seen: str
+    is_you: bool
+
+class ClientCount(TypedDict):
+    client_id: str
+    requests_count: int
+
+class WorkshopSummary(TypedDict):
+    top_clients: List[ClientCount]
+    rate_percentiles: Dict[str, float]  # Requests/Minute je Client: p50, p90, p99, max
+
+class WorkshopStatus(TypedDict):
+    server: str
+    client_id: str
+    server_time: str
+    active_clients: int
+    total_requests: int
+    view: str
+    summary: Optional[WorkshopSummary]
+    clients: List[ClientInfo]
+    offset: int
+    limit: int
+    next_offset: Optional[int]
+
+class SystemInfo(TypedDict):
+    server: str
+    client_id: str
+    metrics: dict
+    system: str
+    python: str
+    host: str
+    dashboard: str
+
+class Contact(TypedDict):
+    name: str
+    email: str
+    phone: str
+
+def render_todos(page: TodoPage) -> str:
+    lines = [f"📝 **Todos für {page['client_id']}:**"]
+    
+    if not page["own_count"]:
+        lines += ["", "🔹 **Deine Aufgaben:** Keine"]
+    
+    current_scope = None
+    for item in page["items"]:
+        if item["scope"] != current_scope:
+            current_scope = item["scope"]
+            lines += ["", "🔹 **Deine Aufgaben:**" if current_scope == "client" else "🌍 **Globale Aufgaben:**"]
+        lines.append(f"{item['number']}. {item['task']}")
+    
+    # Hinweis auf weitere Seiten
+    if page["next_offset"] is not None:
+        remaining = page["total"] - page["next_offset"]
+        lines += ["", f"➡️ {remaining} weitere Todos: get_todos(offset={page['next_offset']}, limit={page['limit']})"]
+    
+    return "\n".join(lines) + "\n"
+
+def render_workshop_status(status: WorkshopStatus) -> str:
+    lines = [
+        "🚀 **Workshop Status (Zentral gehostet):**",
+        f"📊 **Server:** {status['server']}",
+        f"👥 **Aktive Clients:** {status['active_clients']}",
+        f"📨 **Gesamt Requests:** {status['total_requests']}",
+        f"📻 **Dein Client:** {status['client_id']}",
+        f"🕒 **Server-Zeit:** {status['server_time']}",
+    ]
+    
+    if summary := status["summary"]:
+        lines += ["", "🏆 **Aktivste Clients:**"]
+        for rank, client in enumerate(summary["top_clients"], 1):
+            lines.append(f"{rank}. {client['client_id']}: {client['requests_count']} requests")
+        rates = summary["rate_percentiles"]
+        lines += ["", f"📈 **Requests/Minute je Client:** p50 {rates['p50']:.1f} · p90 {rates['p90']:.1f} · "
+                      f"p99 {rates['p99']:.1f} · max {rates['max']:.1f}"]
+        return "\n".join(lines) + "\n"
+    
+    lines += ["", "💻 **Aktive Clients:**"]
+    for client in status["clients"]:
+        indicator = "🟢" if client["is_you"] else "🔵"
+        lines.append(f"{indicator} {client['client_id']}: {client['requests_count']} requests, "
+                     f"zuletzt: {client['last_seen'][:19]}")
+    
+    # Hinweis auf weitere Seiten
+    if status["next_offset"] is not None:
+        remaining = status["active_clients"] - status["next_offset"]
+        lines += ["", f"➡️ {remaining} weitere Clients: get_workshop_status(offset={status['next_offset']}, "
+                      f"limit={status['limit']})"]
+    
+    return "\n".join(lines) + "\n"
+
+def render_system_info(info: SystemInfo) -> str:
+    sample = info["metrics"]
+    return f"""🖥️ **Zentraler Server Status:**
+📊 **Server ID:** {info['server']}
+• CPU Nutzung: {sample['cpu_percent']}%
+• Arbeitsspeicher: {sample['memory_percent']}% ({sample['memory_used'] // 1024**3}GB / {sample['memory_total'] // 1024**3}GB)
+• Festplatte: {sample['disk_percent']}% ({sample['disk_used'] // 1024**3}GB / {sample['disk_total'] // 1024**3}GB)
+• Netzwerk: ↑ {sample['net_sent_per_s'] / 1024:.1f} KB/s, ↓ {sample['net_recv_per_s'] / 1024:.1f} KB/s
+• Messzeitpunkt: {sample['timestamp'][11:19]}
+• System: {info['system']}
+• Python: {info['python']}
+
+📡 **Netzwerk:**
+• Host: {info['host']}
+• Dashboard: {info['dashboard']}
+
+📻 **Dein Client:** {info['client_id']}"""
+
 # =============================================================================
 # ZENTRALE TOOLS
 # =============================================================================
@@ -158,22 +1270,16 @@ def track_tool_usage(tool_name: str):
 def workshop_add_todo(task: str, global_todo: bool = False) -> str:
     """Füge Todo hinzu (client-spezifisch oder global)"""
     client_id = get_client_id()
-    track_client_request(client_id)
     track_tool_usage("Add Todo")
     
-    ensure_data_files()
-    data = json.loads(CENTRAL_NOTES_FILE.read_text())
-    
-    if global_todo:
-        data["global_todos"].append(task)
-        target = "Global"
-    else:
-        if client_id not in data["client_todos"]:
-            data["client_todos"][client_id] = []
-        data["client_todos"][client_id].append(task)
-        target = client_id
+    def add(data: dict) -> str:
+        if global_todo:
+            data["global_todos"].append(task)
+            return "Global"
+        data["client_todos"].setdefault(client_id, []).append(task)
+        return client_id
     
-    CENTRAL_NOTES_FILE.write_text(json.dumps(data, indent=2), encoding='utf-8')
+    target = update_notes(add)
     
     # An Dashboard senden
     dashboard_success = send_to_dashboard("todo", {
@@ -186,24 +1292,56 @@ def workshop_add_todo(task: str, global_todo: bool = False) -> str:
     status = "📡 Live-Dashboard" if dashboard_success else "💾 Zentral"
     return f"✅ Todo hinzugefügt ({status}, {target}): {task}"
 
+@mcp.tool()
+def workshop_add_todos(tasks: List[str], global_todo: bool = False) -> str:
+    """Füge mehrere Todos auf einmal hinzu (ein Speichervorgang, ein Dashboard-Update)"""
+    client_id = get_client_id()
+    
+    tasks = [task for task in tasks if task.strip()]
+    if not tasks:
+        return "❌ Keine Todos angegeben"
+    
+    def add(data: dict) -> str:
+        if global_todo:
+            data["global_todos"].extend(tasks)
+            return "Global"
+        data["client_todos"].setdefault(client_id, []).extend(tasks)
+        return client_id
+    
+    target = update_notes(add)
+    
+    # Ein gebündeltes Update ans Dashboard, die Tool-Usage zählt es mit
+    dashboard_success = send_to_dashboard("todos", {
+        "tasks": tasks,
+        "pc_id": client_id,
+        "global": global_todo,
+        "tool_name": "Add Todos",
+        "timestamp": datetime.now().isoformat()
+    })
+    
+    status = "📡 Live-Dashboard" if dashboard_success else "💾 Zentral"
+    return f"✅ {len(tasks)} Todos hinzugefügt ({status}, {target}):\n" + "\n".join(f"• {task}" for task in tasks)
+
 @mcp.tool()
 def workshop_set_mood(mood: str) -> str:
     """Setze Workshop-Stimmung: 😊 😐 😴 🤯"""
     client_id = get_client_id()
-    track_client_request(client_id)
-    track_tool_usage("Set Mood")
     
     # Validiere Mood
     valid_moods = ["😊", "😐", "😴", "🤯"]
     if mood not in valid_moods:
         return f"❌ Ungültige Stimmung. Wähle: {' '.join(valid_moods)}"
     
-    # An Dashboard senden
-    dashboard_success = send_to_dashboard("mood", {
+    # An Dashboard senden (bei zu vielen Wechseln gewinnt die letzte Stimmung).
+    # Die Tool-Usage zählt das Dashboard über tool_name/count mit, damit auch
+    # sie dem Rate-Limit unterliegt.
+    payload = rate_limiter.submit("mood", client_id, "mood", "mood", {
         "mood": mood,
         "pc_id": client_id,
+        "tool_name": "Set Mood",
         "timestamp": datetime.now().isoformat()
     })
+    dashboard_success = payload is not None and send_to_dashboard("mood", payload)
     
     mood_labels = {
         "😊": "Super!",
@@ -212,128 +1350,163 @@ def workshop_set_mood(mood: str) -> str:
         "🤯": "Overwhelmed"
     }
     
-    status = "📡 Live-Dashboard" if dashboard_success else "💾 Zentral"
+    if payload is None:
+        status = "⏳ Gebündelt"
+    else:
+        status = "📡 Live-Dashboard" if dashboard_success else "💾 Zentral"
     return f"🎭 Stimmung gesetzt ({status}, {client_id}): {mood} {mood_labels[mood]}"
 
+def pull_rope(client_id: str, direction: str, tool_name: str) -> Optional[int]:
+    """Pull ans Dashboard melden; None wenn gesendet, sonst Anzahl gesammelter Pulls
+
+    Die Tool-Usage reist im Tug-Event mit (tool_name, count) statt als eigener
+    POST, damit auch sie dem Rate-Limit unterliegt.
+    """
+    payload = rate_limiter.submit("tug", client_id, "tug", direction, {
+        "direction": direction,
+        "pc_id": client_id,
+        "tool_name": tool_name,
+        "timestamp": datetime.now().isoformat()
+    })
+    if payload is not None:
+        send_to_dashboard("tug", payload)
+        return None
+    return rate_limiter.pending_count("tug", client_id, direction)
+
 @mcp.tool()
 def tug_left() -> str:
     """Ziehe das Seil nach LINKS! ⬅️"""
     client_id = get_client_id()
-    track_client_request(client_id)
-    track_tool_usage("Tug left")
     
-    send_to_dashboard("tug", {
-        "direction": "left",
-        "pc_id": client_id,
-        "timestamp": datetime.now().isoformat()
-    })
+    pending = pull_rope(client_id, "left", "Tug left")
+    if pending:
+        return f"⬅️ {client_id}: Seil nach LINKS gezogen! ({pending} Pulls gebündelt, folgen gleich)"
     return f"⬅️ {client_id}: Seil nach LINKS gezogen!"
 
 @mcp.tool()  
 def tug_right() -> str:
     """Ziehe das Seil nach RECHTS! ➡️"""
     client_id = get_client_id()
-    track_client_request(client_id)
-    track_tool_usage("Tug right")
     
-    send_to_dashboard("tug", {
-        "direction": "right", 
-        "pc_id": client_id,
-        "timestamp": datetime.now().isoformat()
-    })
+    pending = pull_rope(client_id, "right", "Tug right")
+    if pending:
+        return f"➡️ {client_id}: Seil nach RECHTS gezogen! ({pending} Pulls gebündelt, folgen gleich)"
     return f"➡️ {client_id}: Seil nach RECHTS gezogen!"
 
-@mcp.tool()
-def get_todos(show_global: bool = True) -> str:
-    """Zeige Todos an (client-spezifisch und/oder global)"""
+@mcp.tool(output_schema=None)
+def get_todos(show_global: bool = True, limit: int = 50, offset: int = 0,
+              format: OutputFormat = "markdown") -> str | TodoPage:
+    """Zeige Todos an (client-spezifisch und/oder global), seitenweise über limit/offset
+
+    format="json" liefert eine kompakte Struktur statt Markdown.
+    """
     client_id = get_client_id()
-    track_client_request(client_id)
     track_tool_usage("Get Todos")
     
-    ensure_data_files()
-    data = json.loads(CENTRAL_NOTES_FILE.read_text())
-    
-    result = f"📝 **Todos für {client_id}:**\n"
+    data = load_notes()
+    limit = max(1, min(limit, MAX_TODO_PAGE_SIZE))
+    offset = max(0, offset)
     
-    # Client-spezifische Todos
+    # Eigene Todos zuerst, danach globale; nummeriert wird je Liste
     client_todos = data.get("client_todos", {}).get(client_id, [])
-    if client_todos:
-        result += "\n🔹 **Deine Aufgaben:**\n"
-        for i, todo in enumerate(client_todos, 1):
-            result += f"{i}. {todo}\n"
-    else:
-        result += "\n🔹 **Deine Aufgaben:** Keine\n"
-    
-    # Globale Todos
+    items = [TodoItem(scope="client", number=i, task=todo) for i, todo in enumerate(client_todos, 1)]
     if show_global:
-        global_todos = data.get("global_todos", [])
-        if global_todos:
-            result += "\n🌍 **Globale Aufgaben:**\n"
-            for i, todo in enumerate(global_todos, 1):
-                result += f"{i}. {todo}\n"
+        items += [TodoItem(scope="global", number=i, task=todo)
+                  for i, todo in enumerate(data.get("global_todos", []), 1)]
+    page_items = items[offset:offset + limit]
+    next_offset = offset + len(page_items)
     
-    return result
+    page = TodoPage(
+        client_id=client_id,
+        own_count=len(client_todos),
+        total=len(items),
+        offset=offset,
+        limit=limit,
+        next_offset=next_offset if next_offset < len(items) else None,
+        items=page_items
+    )
+    return page if format == "json" else render_todos(page)
 
-@mcp.tool()
-def get_workshop_status() -> str:
-    """Zeige Workshop-Status und aktive Clients"""
+@mcp.tool(output_schema=None)
+def get_workshop_status(view: Literal["clients", "summary"] = "clients", limit: int = 50, offset: int = 0,
+                        top_n: int = 5, format: OutputFormat = "markdown") -> str | WorkshopStatus:
+    """Zeige Workshop-Status und aktive Clients
+
+    view="clients" listet die Clients seitenweise (limit/offset), view="summary"
+    zeigt nur Zähler, die top_n aktivsten Clients und Request-Raten-Perzentile.
+    format="json" liefert strukturierte Daten.
+    """
     client_id = get_client_id()
-    track_client_request(client_id)
     track_tool_usage("Get Status")
     
-    with client_lock:
-        active_count = len(active_clients)
-        total_requests = sum(session.get("requests_count", 0) for session in active_clients.values())
-    
-    result = f"""🚀 **Workshop Status (Zentral gehostet):**
-📊 **Server:** {SERVER_ID}
-👥 **Aktive Clients:** {active_count}
-📨 **Gesamt Requests:** {total_requests}
-📻 **Dein Client:** {client_id}
-🕒 **Server-Zeit:** {datetime.now().strftime("%H:%M:%S")}
-
-💻 **Aktive Clients:**
-"""
+    limit = max(1, min(limit, MAX_STATUS_PAGE_SIZE))
+    offset = max(0, offset)
     
-    with client_lock:
-        for cid, session in active_clients.items():
-            last_seen = session.get("last_seen", "Unbekannt")
-            requests = session.get("requests_count", 0)
-            indicator = "🟢" if cid == client_id else "🔵"
-            result += f"{indicator} {cid}: {requests} requests, zuletzt: {last_seen[:19]}\n"
+    summary = None
+    clients = []
+    next_offset = None
+    if view == "summary":
+        stats = active_clients.summary(top_n=max(1, min(top_n, MAX_STATUS_PAGE_SIZE)))
+        rates = stats["rates_per_minute"]
+        summary = WorkshopSummary(
+            top_clients=[ClientCount(client_id=cid, requests_count=count) for cid, count in stats["top_clients"]],
+            rate_percentiles={
+                "p50": percentile(rates, 50),
+                "p90": percentile(rates, 90),
+                "p99": percentile(rates, 99),
+                "max": max(rates, default=0.0),
+            }
+        )
+    else:
+        stats = active_clients.totals()
+        clients = [
+            ClientInfo(
+                client_id=cid,
+                requests_count=session.get("requests_count", 0),
+                last_seen=session.get("last_seen", "Unbekannt"),
+                is_you=cid == client_id
+            )
+            for cid, session in active_clients.page(offset, limit).items()
+        ]
+        if offset + len(clients) < stats["active_clients"]:
+            next_offset = offset + len(clients)
     
-    return result
+    status = WorkshopStatus(
+        server=SERVER_ID,
+        client_id=client_id,
+        server_time=datetime.now().strftime("%H:%M:%S"),
+        active_clients=stats["active_clients"],
+        total_requests=stats["total_requests"],
+        view=view,
+        summary=summary,
+        clients=clients,
+        offset=offset,
+        limit=limit,
+        next_offset=next_offset
+    )
+    return status if format == "json" else render_workshop_status(status)
 
-@mcp.tool()
-def server_system_info() -> str:
-    """Zeige Server-System-Informationen"""
+@mcp.tool(output_schema=None)
+def server_system_info(format: OutputFormat = "markdown") -> str | SystemInfo:
+    """Zeige Server-System-Informationen (format="json" für strukturierte Daten)"""
     client_id = get_client_id()
-    track_client_request(client_id)
     track_tool_usage("Get System Info")
     
-    cpu_percent = psutil.cpu_percent(interval=1)
-    memory = psutil.virtual_memory()
-    disk = psutil.disk_usage('/')
-    
-    return f"""🖥️ **Zentraler Server Status:**
-📊 **Server ID:** {SERVER_ID}
-• CPU Nutzung: {cpu_percent}%
-• Arbeitsspeicher: {memory.percent}% ({memory.used // 1024**3}GB / {memory.total // 1024**3}GB)
-• Festplatte: {disk.percent}% ({disk.used // 1024**3}GB / {disk.total // 1024**3}GB)
-• System: {platform.system()} {platform.release()}
-• Python: {platform.python_version()}
-
-📡 **Netzwerk:**
-• Host: {HOST}:{PORT}
-• Dashboard: {DASHBOARD_URL}
-
-📻 **Dein Client:** {client_id}"""
+    info = SystemInfo(
+        server=SERVER_ID,
+        client_id=client_id,
+        metrics=system_metrics.latest(),
+        system=f"{platform.system()} {platform.release()}",
+        python=platform.python_version(),
+        host=f"{HOST}:{PORT}",
+        dashboard=DASHBOARD_URL
+    )
+    return info if format == "json" else render_system_info(info)
 
 @mcp.tool()
 def quick_search(query: str) -> str:
     """Info über Google-Suche (öffnet nicht direkt)"""
     client_id = get_client_id()
-    track_client_request(client_id)
     track_tool_usage("Quick Search")
     
     search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
@@ -348,22 +1521,56 @@ Kopiere die URL und öffne sie in deinem lokalen Browser."""
 # RESOURCES
 # =============================================================================
 
-@mcp.resource("uri://assistant/contacts")
-def contacts_resource() -> str:
-    """Zentrale Workshop-Kontakte"""
-    ensure_data_files()
-    
+WORKSHOP_SCHEDULE = [
+    {"time": "09:00", "event": "🚀 FastMCP Workshop Start", "location": "Schulungsraum A", "status": "✅"},
+    {"time": "09:15", "event": "📚 MCP Grundlagen", "location": "Schulungsraum A", "status": "✅"},
+    {"time": "09:30", "event": "💻 Hands-On Development", "location": "Schulungsraum A", "status": "🔄"},
+    {"time": "10:30", "event": "☕ Kaffeepause", "location": "Lounge", "status": "⏳"},
+    {"time": "11:00", "event": "🔗 Zentrale Server Integration", "location": "Schulungsraum A", "status": "⏳"},
+    {"time": "11:30", "event": "🚀 Live Demo & Test", "location": "Schulungsraum A", "status": "⏳"},
+    {"time": "12:00", "event": "🎉 Wrap-up & Q&A", "location": "Schulungsraum A", "status": "⏳"}
+]
+
+@render_cache.cached(source=CENTRAL_CONTACTS_FILE)
+def load_contacts() -> List[Contact]:
+    """Kontakte als Liste, neu gelesen nur wenn sich die Datei ändert"""
     data = json.loads(CENTRAL_CONTACTS_FILE.read_text())
-    contacts = data.get("contacts", [])
+    return [
+        Contact(name=contact["name"], email=contact["email"], phone=contact["phone"])
+        for contact in data.get("contacts", [])
+    ]
+
+@render_cache.cached(source=CENTRAL_CONTACTS_FILE)
+def render_contacts() -> str:
+    """Kontakte-Text, neu gebaut nur wenn sich die Datei ändert"""
+    lines = ["👥 **Zentrale Workshop-Kontakte:**", ""]
+    for contact in load_contacts():
+        lines += [f"**{contact['name']}**", f"📧 {contact['email']}", f"📞 {contact['phone']}", ""]
     
-    result = f"👥 **Zentrale Workshop-Kontakte:**\n\n"
-    for contact in contacts:
-        result += f"**{contact['name']}**\n"
-        result += f"📧 {contact['email']}\n"
-        result += f"📞 {contact['phone']}\n\n"
+    return "\n".join(lines) + "\n"
+
+@render_cache.cached(ttl=RENDER_CACHE_TTL)
+def render_schedule_items() -> str:
+    """Statischer Teil des Zeitplans (ohne Datum und Client)"""
+    result = ""
+    for item in WORKSHOP_SCHEDULE:
+        result += f"{item['status']} **{item['time']}** - {item['event']}\n"
+        result += f"📍 {item['location']}\n\n"
     
     return result
 
+@mcp.resource("uri://assistant/contacts")
+def contacts_resource() -> str:
+    """Zentrale Workshop-Kontakte"""
+    ensure_data_files()
+    return render_contacts()
+
+@mcp.resource("uri://assistant/contacts/json", mime_type="application/json")
+def contacts_json_resource() -> dict:
+    """Zentrale Workshop-Kontakte als strukturierte Liste"""
+    ensure_data_files()
+    return {"contacts": load_contacts()}
+
 @mcp.resource("uri://assistant/workshop-schedule")
 def workshop_schedule_resource() -> str:
     """Workshop-Terminkalender"""
@@ -371,61 +1578,106 @@ def workshop_schedule_resource() -> str:
     today = current_time.strftime("%A, %d. %B %Y")
     client_id = get_client_id()
     
-    schedule = [
-        {"time": "09:00", "event": "🚀 FastMCP Workshop Start", "location": "Schulungsraum A", "status": "✅"},
-        {"time": "09:15", "event": "📚 MCP Grundlagen", "location": "Schulungsraum A", "status": "✅"},
-        {"time": "09:30", "event": "💻 Hands-On Development", "location": "Schulungsraum A", "status": "🔄"},
-        {"time": "10:30", "event": "☕ Kaffeepause", "location": "Lounge", "status": "⏳"},
-        {"time": "11:00", "event": "🔗 Zentrale Server Integration", "location": "Schulungsraum A", "status": "⏳"},
-        {"time": "11:30", "event": "🚀 Live Demo & Test", "location": "Schulungsraum A", "status": "⏳"},
-        {"time": "12:00", "event": "🎉 Wrap-up & Q&A", "location": "Schulungsraum A", "status": "⏳"}
-    ]
-    
     result = f"📅 **FastMCP Workshop - {today}:**\n"
     result += f"📻 **Dein Client:** {client_id}\n"
     result += f"🖥️ **Zentraler Server:** {SERVER_ID}\n\n"
     
-    for item in schedule:
-        result += f"{item['status']} **{item['time']}** - {item['event']}\n"
-        result += f"📍 {item['location']}\n\n"
+    return result + render_schedule_items()
+
+@mcp.resource("uri://assistant/system-metrics")
+def system_metrics_resource() -> str:
+    """Server-Metriken: Min/Avg/Max über das letzte Messfenster"""
+    history = system_metrics.history()
+    window = history["samples"] * history["interval"]
+    
+    result = f"📈 **System-Metriken {SERVER_ID}** (letzte {history['samples']} Proben, ~{window:.0f}s):\n\n"
+    for key, stats in history["stats"].items():
+        result += f"• {key}: min {stats['min']:.1f} / avg {stats['avg']:.1f} / max {stats['max']:.1f}\n"
+    
+    cache = render_cache.stats()
+    result += f"\n🗃️ **Render-Cache:** {cache['hits']} Hits / {cache['misses']} Misses "
+    result += f"({cache['hit_rate']:.0%}), {cache['entries']} Einträge\n"
+    
+    limits = rate_limiter.stats()
+    result += "🚦 **Rate-Limits:** " + ", ".join(
+        f"{c} {limits['sent'][c]} gesendet / {limits['deferred'][c]} gesammelt" for c in limits["sent"])
+    result += f", {limits['pending']} ausstehend\n"
+    
+    dedup = idempotency_cache.stats()
+    result += f"🔁 **Idempotenz:** {dedup['hits']} Wiederholungen abgefangen / {dedup['misses']} ausgeführt, "
+    result += f"{dedup['entries']} Einträge im Fenster\n"
+    
+    return result
+
+@mcp.resource("uri://assistant/metrics")
+def metrics_resource() -> str:
+    """Latenz-, Fehler- und Client-Metriken des zentralen Servers"""
+    snap = call_metrics.snapshot()
+    
+    result = f"⏱️ **Call-Metriken {SERVER_ID}:**\n\n"
+    for (kind, name), entry in sorted(snap["calls"].items(), key=lambda x: -x[1]["sum"]):
+        avg_ms = entry["sum"] / entry["count"] * 1000
+        result += f"• [{kind}] {name}: {entry['count']} Aufrufe, {entry['errors']} Fehler, Ø {avg_ms:.1f} ms\n"
+    
+    if snap["spans"]:
+        result += "\n🔬 **Teilschritte:**\n"
+        for (call, span), entry in sorted(snap["spans"].items()):
+            avg_ms = entry["sum"] / entry["count"] * 1000
+            result += f"• {call} → {span}: {entry['count']}x, Ø {avg_ms:.1f} ms, max {entry['max'] * 1000:.1f} ms\n"
+    
+    if snap["client_rates"]:
+        result += "\n👥 **Requests/Minute je Client:**\n"
+        for cid, rate in sorted(snap["client_rates"].items(), key=lambda x: -x[1]):
+            result += f"• {cid}: {rate:.1f}/min ({snap['client_totals'].get(cid, 0)} gesamt)\n"
     
+    result += f"\n📄 Plain-Text: http://{HOST}:{PORT}/metrics\n"
     return result
 
 # =============================================================================
 # PROMPTS
 # =============================================================================
 
-@mcp.prompt()
-def workshop_briefing() -> str:
-    """Workshop-Briefing für zentralen Server"""
-    client_id = get_client_id()
-    current_time = datetime.now().strftime("%H:%M")
-    
-    return f"""👋 **Willkommen zum FastMCP Workshop! (Zentral gehostet)**
-
-🕒 **Aktuelle Zeit:** {current_time}
-📻 **Dein Client:** {client_id}
-🖥️ **Zentraler Server:** {SERVER_ID}
-
-📡 **Live-Dashboard:** {DASHBOARD_URL}
+@render_cache.cached(ttl=RENDER_CACHE_TTL)
+def render_briefing_body() -> str:
+    """Statischer Teil des Briefings (Tool- und Resource-Übersicht)"""
+    return f"""📡 **Live-Dashboard:** {DASHBOARD_URL}
 
 🚀 **Deine Workshop-Tools:**
 • `workshop_add_todo(task, global_todo=False)` - Todo hinzufügen
+• `workshop_add_todos(tasks, global_todo=False)` - Mehrere Todos auf einmal
 • `workshop_set_mood(mood)` - Stimmung teilen (😊😐😴🤯)
-• `get_workshop_status()` - Workshop-Status anzeigen
+• `get_workshop_status(view="clients"|"summary")` - Workshop-Status anzeigen
 • `server_system_info()` - Server-System-Info
 
+🧾 `get_todos`, `get_workshop_status` und `server_system_info` liefern mit `format="json"` strukturierte Daten
+
 💻 **Standard-Tools:**
-• `get_todos(show_global=True)` - Todos anzeigen
+• `get_todos(show_global=True, limit=50, offset=0)` - Todos anzeigen (seitenweise)
 • `quick_search(query)` - Google-Suche (URL)
 • `tug_left()` / `tug_right()` - Seilziehen
 
 📊 **Resources:**
-• uri://assistant/contacts - Workshop-Kontakte
+• uri://assistant/contacts - Workshop-Kontakte (JSON: uri://assistant/contacts/json)
 • uri://assistant/workshop-schedule - Workshop-Zeitplan
+• uri://assistant/system-metrics - Server-Metriken (Verlauf)
+• uri://assistant/metrics - Latenz- und Fehler-Metriken
 
 🎯 **Los geht's!** Wie kann ich dir beim Workshop helfen?"""
 
+@mcp.prompt()
+def workshop_briefing() -> str:
+    """Workshop-Briefing für zentralen Server"""
+    client_id = get_client_id()
+    current_time = datetime.now().strftime("%H:%M")
+    
+    return f"""👋 **Willkommen zum FastMCP Workshop! (Zentral gehostet)**
+
+🕒 **Aktuelle Zeit:** {current_time}
+📻 **Dein Client:** {client_id}
+🖥️ **Zentraler Server:** {SERVER_ID}
+
+""" + render_briefing_body()
+
 # =============================================================================
 # SERVER CLEANUP & MONITORING
 # =============================================================================
@@ -434,23 +1686,64 @@ def cleanup_inactive_clients():
     """Entferne inaktive Clients (Hintergrund-Task)"""
     while True:
         try:
-            current_time = datetime.now()
-            with client_lock:
-                inactive_clients = []
-                for client_id, session in active_clients.items():
-                    last_seen = datetime.fromisoformat(session["last_seen"])
-                    if (current_time - last_seen).seconds > 300:  # 5 Minuten
-                        inactive_clients.append(client_id)
-                
-                for client_id in inactive_clients:
-                    print(f"🧹 Removing inactive client: {client_id}")
-                    del active_clients[client_id]
+            for client_id in active_clients.expire():
+                print(f"🧹 Removing inactive client: {client_id}")
             
-            time.sleep(60)  # Prüfe jede Minute
+            # Bis zur nächsten fälligen Session schlafen, höchstens eine Minute
+            wait = active_clients.seconds_until_next_expiry()
+            time.sleep(60 if wait is None else min(60, max(1, wait)))
         except Exception as e:
             print(f"❌ Cleanup error: {e}")
             time.sleep(60)
 
+def probe_dashboard():
+    """Dashboard-Verbindung im Hintergrund testen, ohne den Start zu blockieren"""
+    import requests
+    try:
+        response = requests.get(f"{DASHBOARD_URL}/api/dashboard-data", timeout=3)
+        if response.status_code == 200:
+            startup_state["dashboard"] = "verbunden"
+            print("✅ Dashboard-Verbindung erfolgreich!")
+        else:
+            startup_state["dashboard"] = f"HTTP {response.status_code}"
+            print("⚠️ Dashboard erreichbar aber Fehler")
+    except:
+        startup_state["dashboard"] = "offline"
+        print("❌ Dashboard nicht erreichbar (läuft offline)")
+
+async def mark_ready(servers: list):
+    """Startzeit messen, sobald alle uvicorn-Server Verbindungen annehmen"""
+    while not all(server.started for server in servers):
+        await asyncio.sleep(0.005)
+    startup_state["ready_ms"] = round((time.perf_counter() - STARTUP_T0) * 1000, 1)
+    startup_state["ready"] = True
+    print(f"⚡ Bereit nach {startup_state['ready_ms']:.0f} ms (seit Prozessstart)")
+
+async def run_servers():
+    """MCP Server (und im eingebetteten Modus das Dashboard) in einem Event-Loop
+
+    Im eingebetteten Modus behalten beide ihre Ports: LLM-Clients verbinden
+    sich wie gewohnt mit dem MCP Server, entfernte Workshop-PCs erreichen
+    weiterhin /api/* des Dashboards. Events der eigenen Tools laufen über den
+    In-Memory-Bus.
+    """
+    global dashboard_bus
+    import uvicorn
+
+    if STATELESS_HTTP:
+        mcp_app = mcp.http_app(transport="http", stateless_http=True)
+    else:
+        mcp_app = mcp.http_app(transport="sse")
+    servers = [uvicorn.Server(uvicorn.Config(mcp_app, host=HOST, port=PORT, timeout_graceful_shutdown=0))]
+
+    if EMBED_DASHBOARD:
+        import dashboard_fastapi
+        dashboard_bus = dashboard_fastapi.event_bus
+        dashboard_bus.attach(asyncio.get_running_loop())
+        servers.append(uvicorn.Server(uvicorn.Config(dashboard_fastapi.app, host=HOST, port=DASHBOARD_PORT)))
+
+    await asyncio.gather(mark_ready(servers), *(server.serve() for server in servers))
+
 # =============================================================================
 # SERVER STARTEN
 # =============================================================================
@@ -464,27 +1757,41 @@ if __name__ == "__main__":
     print("🚀 " + "="*70)
     print(f"🖥️ Server ID: {SERVER_ID}")
     print(f"📡 Host: {HOST}:{PORT}")
-    print(f"📊 Dashboard URL: {DASHBOARD_URL}")
+    print(f"📊 Dashboard URL: {f'eingebettet (Port {DASHBOARD_PORT})' if EMBED_DASHBOARD else DASHBOARD_URL}")
     print(f"💾 Daten-Verzeichnis: {DATA_DIR}")
+    print(f"⏱️ Metriken: http://{HOST}:{PORT}/metrics (Health: /healthz, /readyz)")
+    if TRACE_ENABLED:
+        print(f"🧵 Tracing aktiv: {TRACE_FILE}")
     print("🔗 Bereit für Langflow Integration!")
     print("🚀 " + "="*70)
     
-    # Dashboard-Verbindung testen
-    try:
-        response = requests.get(f"{DASHBOARD_URL}/api/dashboard-data", timeout=3)
-        if response.status_code == 200:
-            print("✅ Dashboard-Verbindung erfolgreich!")
-        else:
-            print("⚠️ Dashboard erreichbar aber Fehler")
-    except:
-        print("❌ Dashboard nicht erreichbar (läuft offline)")
+    # Dashboard-Verbindung im Hintergrund testen (entfällt im eingebetteten Modus)
+    if EMBED_DASHBOARD:
+        startup_state["dashboard"] = "eingebettet"
+    else:
+        threading.Thread(target=probe_dashboard, daemon=True).start()
     
     # Cleanup-Thread starten
     cleanup_thread = threading.Thread(target=cleanup_inactive_clients, daemon=True)
     cleanup_thread.start()
     print("🧹 Client-Cleanup Thread gestartet")
     
+    # System-Metriken im Hintergrund sammeln
+    system_metrics.start()
+    print(f"📈 System-Metriken Sampler gestartet (alle {METRICS_SAMPLE_INTERVAL}s)")
+    
+    # Gesammelte Tauzieh-/Stimmungs-Events gebündelt nachsenden
+    rate_limiter.start()
+    print("🚦 Rate-Limits: " + ", ".join(f"{c} {r:g}/s (Burst {b})" for c, (r, b) in RATE_LIMITS.items()))
+    
     print("🚀 Server startet...")
     
     # Server starten
-    mcp.run(transport="sse", host=HOST, port=PORT)
\ No newline at end of file
+    if EMBED_DASHBOARD:
+        print(f"🧷 Eingebettetes Dashboard: http://{HOST}:{DASHBOARD_PORT} (In-Memory-Events)")
+    elif STATELESS_HTTP:
+        print(f"🧩 Stateless Streamable-HTTP (Store: {SHARED_STORE_FILE if USE_SHARED_STORE else 'im Prozess'})")
+    try:
+        asyncio.run(run_servers())
+    except KeyboardInterrupt:
+        print("👋 Server beendet")
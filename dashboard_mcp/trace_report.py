@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Auswertung der End-to-End-Traces (WORKSHOP_TRACE=1)
+Führt die Trace-Dateien von MCP Server und Dashboard über die trace_id
+zusammen und zeigt, wo die Zeit zwischen Tool-Aufruf und Beamer-Frame bleibt
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, List
+
+from workshop_tracing import percentile
+
+DEFAULT_FILES = ["workshop_data/traces.jsonl", "dashboard_traces.jsonl"]
+
+# Reihenfolge der Stufen entlang des Weges eines Events
+STAGE_ORDER = ["mcp_tool", "send_to_dashboard", "dashboard_handler", "save_data", "ws_broadcast", "frame_rendered"]
+
+def load_spans(paths: List[str]) -> List[dict]:
+    spans = []
+    for path in paths:
+        file = Path(path)
+        if not file.exists():
+            print(f"⚠️ {path} nicht gefunden, übersprungen")
+            continue
+        for line in file.read_text(encoding="utf-8").splitlines():
+            try:
+                spans.append(json.loads(line))
+            except ValueError:
+                continue  # Abgeschnittene letzte Zeile
+    return spans
+
+def stage_key(stage: str) -> tuple:
+    return (STAGE_ORDER.index(stage) if stage in STAGE_ORDER else len(STAGE_ORDER), stage)
+
+def stage_stats(spans: List[dict]) -> Dict[str, dict]:
+    by_stage: Dict[str, List[float]] = {}
+    for span in spans:
+        by_stage.setdefault(span["stage"], []).append(span["duration_ms"])
+    return {
+        stage: {
+            "count": len(durations),
+            "p50_ms": percentile(durations, 50),
+            "p90_ms": percentile(durations, 90),
+            "p99_ms": percentile(durations, 99),
+            "max_ms": max(durations),
+        }
+        for stage, durations in sorted(by_stage.items(), key=lambda x: stage_key(x[0]))
+    }
+
+def traces(spans: List[dict]) -> List[dict]:
+    """Je trace_id: Gesamtdauer vom ersten Span-Start bis zum letzten Span-Ende"""
+    grouped: Dict[str, List[dict]] = {}
+    for span in spans:
+        grouped.setdefault(span["trace_id"], []).append(span)
+
+    result = []
+    for trace_id, items in grouped.items():
+        start = min(s["start"] for s in items)
+        end = max(s["start"] + s["duration_ms"] / 1000 for s in items)
+        tool = next((s["name"] for s in items if s["stage"] == "mcp_tool"), "?")
+        result.append({
+            "trace_id": trace_id,
+            "tool": tool,
+            "total_ms": (end - start) * 1000,
+            "spans": sorted(items, key=lambda s: s["start"]),
+        })
+    return sorted(result, key=lambda t: -t["total_ms"])
+
+def print_report(spans: List[dict], slowest: int):
+    all_traces = traces(spans)
+    totals = [t["total_ms"] for t in all_traces]
+    print(f"🧵 {len(all_traces)} Traces, {len(spans)} Spans")
+    if not spans:
+        return
+    print(f"⏱️ End-to-End: p50 {percentile(totals, 50):.1f} ms, p90 {percentile(totals, 90):.1f} ms, "
+          f"p99 {percentile(totals, 99):.1f} ms, max {max(totals):.1f} ms\n")
+
+    print(f"{'Stufe':<20}{'Anzahl':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    for stage, stats in stage_stats(spans).items():
+        print(f"{stage:<20}{stats['count']:>8}{stats['p50_ms']:>8.1f}ms{stats['p90_ms']:>8.1f}ms"
+              f"{stats['p99_ms']:>8.1f}ms{stats['max_ms']:>8.1f}ms")
+
+    if slowest:
+        print(f"\n🐢 Langsamste {min(slowest, len(all_traces))} Traces:")
+        for trace in all_traces[:slowest]:
+            print(f"• {trace['trace_id']} ({trace['tool']}): {trace['total_ms']:.1f} ms")
+            origin = trace["spans"][0]["start"]
+            for span in trace["spans"]:
+                offset = (span["start"] - origin) * 1000
+                print(f"    +{offset:7.1f} ms  {span['stage']:<18} {span['duration_ms']:8.1f} ms  {span['name']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Latenz-Aufschlüsselung der Workshop-Traces je Stufe")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES, help="Trace-Dateien (JSON-Lines)")
+    parser.add_argument("--slowest", type=int, default=5, help="Die N langsamsten Traces im Detail zeigen")
+    parser.add_argument("--tool", help="Nur Traces dieses Tools auswerten")
+    args = parser.parse_args()
+
+    spans = load_spans(args.files)
+    if args.tool:
+        keep = {s["trace_id"] for s in spans if s["stage"] == "mcp_tool" and s["name"] == args.tool}
+        spans = [s for s in spans if s["trace_id"] in keep]
+    print_report(spans, args.slowest)
+
+if __name__ == "__main__":
+    main()
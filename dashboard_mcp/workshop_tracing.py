@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Gemeinsame Mess-Helfer für MCP Server, Dashboard und Auswertungs-Skripte
+Trace-Dateien (JSON-Lines) und Perzentile, damit alle dieselben Zahlen liefern
+"""
+
+import contextvars
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-Rank-Perzentil (0.0 für leere Listen)"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, math.ceil(pct / 100 * len(values)) - 1))]
+
+class TraceLog:
+    """Span-Zeiten als JSON-Lines in einer lokalen Trace-Datei
+
+    Eine Zeile pro Span: trace_id, source, stage, name, start (Unix-Zeit)
+    und duration_ms. MCP Server und Dashboard schreiben je eine eigene
+    Datei; trace_report.py führt beide über die trace_id zusammen.
+    """
+
+    def __init__(self, path: Path, source: str, enabled: bool, current_trace: contextvars.ContextVar):
+        self.path = path
+        self.source = source
+        self.enabled = enabled
+        self.current_trace = current_trace
+        self._file = None
+        self._lock = threading.Lock()
+
+    def record(self, trace_id: str, stage: str, name: str, start: float, duration: float):
+        if not self.enabled or trace_id is None:
+            return
+        line = json.dumps({
+            "trace_id": trace_id,
+            "source": self.source,
+            "stage": stage,
+            "name": name,
+            "start": start,
+            "duration_ms": round(duration * 1000, 3),
+        }, ensure_ascii=False)
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+            self._file.write(line + "\n")
+
+    @contextmanager
+    def span(self, stage: str, name: str = ""):
+        """Span für die Trace-ID des laufenden Aufrufs aufzeichnen"""
+        trace_id = self.current_trace.get()
+        if not self.enabled or trace_id is None:
+            yield
+            return
+        start = time.time()
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(trace_id, stage, name, start, time.perf_counter() - begin)